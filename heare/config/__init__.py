@@ -1,24 +1,74 @@
 import copy
+import functools
 import glob
+import keyword
 import os
 import re
 import sys
+import threading
+import time
 import typing
+import weakref
 from abc import ABCMeta, abstractmethod
 from collections import defaultdict
 from json import JSONEncoder
 from typing import TypeVar, Generic, Callable, \
-    Optional, List, Tuple, Union, Dict, Generator, Set
+    Optional, List, Tuple, Union, Dict, Generator, Set, Any, Iterable, \
+    Sequence
 import configparser
+import json
+
+try:
+    import tomllib
+except ImportError:  # pragma: no cover - python < 3.11
+    try:
+        import tomli as tomllib  # type: ignore
+    except ImportError:
+        tomllib = None  # type: ignore
+
+from heare.config.formatters import Formatter, boolean
 
 T = TypeVar('T')
 
 
+def _builtin_formatter(formatter: Callable[[str], T]) -> Callable[[str], T]:
+    """
+    bool(value) is truthy for any non-empty string, e.g. "false", so bool
+    settings are parsed with the boolean formatter instead.
+    """
+    if formatter is bool:
+        return typing.cast(Callable[[str], T], boolean)
+    return formatter
+
+
+def _from_typed(value: Any, formatter: type) -> Any:
+    """
+    Values from typed sources, such as JSON or TOML numbers or a bare
+    command line flag, are used as-is when they are already of the type a
+    formatter produces, and otherwise only converted without loss.
+    :raises ValueError: if the value is of another type, e.g. true or 1.9
+        for an int setting
+    """
+    value_type = value.__class__
+    if isinstance(value, formatter) and \
+            (value_type is not bool or formatter is bool):
+        return value
+    if formatter is float and value_type is int:
+        return float(value)
+    if formatter is int and value_type is float and value.is_integer():
+        return int(value)
+    raise ValueError(
+        f"{value!r} of type {value_type.__name__} cannot be parsed as "
+        f"{formatter.__name__}"
+    )
+
+
 class SettingAliases(object):
     def __init__(self,
                  flag: Optional[str] = None,
                  short_flag: Optional[str] = None,
-                 env_variable: Optional[str] = None):
+                 env_variable: Optional[str] = None,
+                 file: Optional[str] = None):
         """
         Specify aliases for a config property
         :param flag: an alternate flag name that does not
@@ -26,14 +76,18 @@ class SettingAliases(object):
         :param short_flag: maps short-flag name for CLI parsing
         :param env_variable: maps an environment variable
             name to the property
+        :param file: path of a file holding the value, such as a mounted
+            secret, read when the setting is first used
         """
         self.flag: Optional[str] = flag
         self.short_flag: Optional[str] = short_flag
         self.env_variable: Optional[str] = env_variable
+        self.file: Optional[str] = file
 
     def labels(self) -> List[str]:
         return list(filter(None,
-                           [self.flag, self.short_flag, self.env_variable]))
+                           [self.flag, self.short_flag, self.env_variable,
+                            self.file]))
 
     def __str__(self) -> str:
         parts = [
@@ -69,12 +123,14 @@ class Setting(Generic[T]):
         :param default: default value if no configuration is specified
         :param required: indicates that this property is required
         """
-        self.formatter: Callable[[str], T] = formatter
+        self.formatter: Callable[[str], T] = _builtin_formatter(formatter)
         self.default: Optional[T] = default
         self.required: bool = required
         self.aliases: Optional[SettingAliases] = aliases
 
-    def from_raw_value(self, value: str) -> T:
+    def from_raw_value(self, value: Any) -> T:
+        if value.__class__ is not str and isinstance(self.formatter, type):
+            return _from_typed(value, self.formatter)
         try:
             return self.formatter(value)
         except Exception as _:
@@ -96,12 +152,23 @@ class Setting(Generic[T]):
     def get(self) -> Optional[T]:
         return self.default
 
-    def to_gettable(self, value: List[T]):
+    def to_gettable(self, value: List[T], key: Optional[str] = None):
         return GettableSetting(
             value,
             self.formatter,
             self.default,
-            self.required
+            self.required,
+            key
+        )
+
+    def to_file_gettable(self, secret_file: 'SecretFile',
+                         key: Optional[str] = None):
+        return FileBackedSetting(
+            secret_file,
+            self.formatter,
+            self.default,
+            self.required,
+            key
         )
 
 
@@ -110,13 +177,19 @@ class GettableSetting(Setting[T]):
                  value: Optional[T],
                  formatter: Callable[[str], T],
                  default: Optional[T] = None,
-                 required: bool = True):
+                 required: bool = True,
+                 key: Optional[str] = None):
+        """
+        A loaded setting value.
+        :param key: fully qualified name of the setting, <namespace>.<name>
+        """
         super().__init__(
             formatter=formatter,
             default=default,
             required=required
         )
         self.value: Optional[T] = value
+        self.key: Optional[str] = key
 
     def get(self) -> Optional[T]:
         return self.value
@@ -134,17 +207,35 @@ class ListSetting(Generic[T]):
         :param default: default value if no configuration is specified
         :param required: indicates that this property is required
         """
-        self.formatter: Callable[[str], T] = formatter
+        self.formatter: Callable[[str], T] = _builtin_formatter(formatter)
         self.default: Optional[List[T]] = default
         self.required: bool = required
         self.aliases: Optional[SettingAliases] = aliases
 
-    def from_raw_value(self, value: str) -> List[T]:
+    def from_raw_value(self, value: Any) -> List[T]:
         result: List[T] = []
-        # ListSetting assumes values are CSV. Repeated command line flags
-        # must be treated specially, but will also work with csv values.
-        value_parts = value.split(",") if isinstance(value, str) else [value]
+        value_parts: Sequence[Any]
+        # ListSetting assumes string values are CSV. Repeated command line
+        # flags must be treated specially, but will also work with csv
+        # values. Typed sources (JSON, TOML) may supply native arrays.
+        if isinstance(value, str):
+            value_parts = value.split(",")
+        elif isinstance(value, (list, tuple)):
+            value_parts = value
+        else:
+            value_parts = [value]
+        if isinstance(self.formatter, Formatter):
+            try:
+                return self.formatter.parse_many(value_parts)
+            except Exception as _:
+                raise ValueError(
+                    f"{value} cannot be parsed as {self.formatter.__name__}"
+                )
         for part in value_parts:
+            if part.__class__ is not str and \
+                    isinstance(self.formatter, type):
+                result.append(_from_typed(part, self.formatter))
+                continue
             try:
                 result.append(self.formatter(part))
             except Exception as _:
@@ -156,12 +247,23 @@ class ListSetting(Generic[T]):
     def get(self) -> Optional[List[T]]:
         return self.default
 
-    def to_gettable(self, value: List[T]):
+    def to_gettable(self, value: List[T], key: Optional[str] = None):
         return GettableListSetting(
             value,
             self.formatter,
             self.default,
-            self.required
+            self.required,
+            key
+        )
+
+    def to_file_gettable(self, secret_file: 'SecretFile',
+                         key: Optional[str] = None):
+        return FileBackedListSetting(
+            secret_file,
+            self.formatter,
+            self.default,
+            self.required,
+            key
         )
 
     def __str__(self) -> str:
@@ -181,18 +283,226 @@ class GettableListSetting(ListSetting[T]):
                  value: Optional[List[T]],
                  formatter: Callable[[str], T],
                  default: Optional[List[T]] = None,
-                 required: bool = True):
+                 required: bool = True,
+                 key: Optional[str] = None):
+        """
+        A loaded list setting value.
+        :param key: fully qualified name of the setting, <namespace>.<name>
+        """
         super().__init__(
             formatter=formatter,
             default=default,
             required=required
         )
         self.value: Optional[List[T]] = value
+        self.key: Optional[str] = key
 
     def get(self) -> Optional[List[T]]:
         return self.value
 
 
+class SecretFile(object):
+    def __init__(self, path: str, cache: 'SecretFileCache'):
+        """
+        A file holding a setting value, read on first use and re-read when
+        its cache finds the file has changed.
+        :param path: path of the file
+        :param cache: the SecretFileCache tracking this file
+        """
+        self.path: str = path
+        self.cache: 'SecretFileCache' = cache
+        self.content: Optional[str] = None
+        self.signature: Optional[Tuple[int, int, int]] = None
+        # incremented each time the file is read, so readers can tell
+        # whether their parsed value is current
+        self.version: int = 0
+        self.stale: bool = True
+        # when the file was first found unreadable, and why, if it still is
+        self.missing_since: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def read(self) -> Tuple[int, str]:
+        """
+        :return: the version and content of the file, with a single trailing
+            newline removed. If the file cannot be read, as while it is
+            briefly missing during rotation, the last content read is
+            returned for one ttl of its cache, and the file is retried after
+            each check.
+        :raises OSError: if the file cannot be read, and either never has
+            been or has been unreadable for longer than the ttl
+        """
+        self.cache.revalidate_if_due()
+        if self.stale:
+            try:
+                with open(self.path, 'r') as fh:
+                    stat = os.fstat(fh.fileno())
+                    content = fh.read()
+            except OSError as ex:
+                if self.missing_since is None:
+                    self.missing_since = self.cache.clock()
+                self.error = str(ex)
+                # never matches a stat, so the next check marks it stale
+                self.signature = _MISSING_SIGNATURE
+                self.stale = False
+            else:
+                if content.endswith('\n'):
+                    content = content[:-2] if content.endswith('\r\n') \
+                        else content[:-1]
+                self.content = content
+                self.signature = _stat_signature(stat)
+                self.version += 1
+                self.stale = False
+                self.missing_since = None
+                self.error = None
+
+        if self.missing_since is not None and (
+                self.content is None or
+                self.cache.clock() - self.missing_since >= self.cache.ttl):
+            raise OSError(self.error)
+        return self.version, typing.cast(str, self.content)
+
+    def __str__(self) -> str:
+        return f"<{self.__class__.__module__}.{self.__class__.__name__} " \
+               f"path={self.path} />"
+
+
+def _stat_signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+_MISSING_SIGNATURE = (-1, -1, -1)
+
+
+class SecretFileCache(object):
+    def __init__(self,
+                 ttl: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Tracks SecretFiles, checking all of them for changes at most once
+        per ttl with one batch of stat calls. Between checks, reading a
+        SecretFile makes no system calls.
+        :param ttl: seconds between checks for changed files
+        :param clock: time source
+        """
+        self.ttl: float = ttl
+        self.clock: Callable[[], float] = clock
+        self.files: Dict[str, SecretFile] = {}
+        self.checked_at: float = clock()
+        self.lock = threading.Lock()
+
+    def file(self, path: str) -> SecretFile:
+        secret_file = self.files.get(path)
+        if secret_file is None:
+            with self.lock:
+                secret_file = self.files.setdefault(
+                    path, SecretFile(path, self))
+        return secret_file
+
+    def revalidate_if_due(self) -> None:
+        if self.clock() - self.checked_at >= self.ttl:
+            self.revalidate()
+
+    def revalidate(self) -> None:
+        """
+        Stat every tracked file that has been read, marking changed or
+        missing files stale so they are re-read on next use.
+        """
+        with self.lock:
+            self.checked_at = self.clock()
+            secret_files = list(self.files.values())
+        for secret_file in secret_files:
+            if secret_file.signature is None:
+                continue
+            try:
+                signature = _stat_signature(os.stat(secret_file.path))
+            except OSError:
+                signature = None
+            if signature != secret_file.signature:
+                secret_file.stale = True
+
+
+# shared by sources which are not given their own cache
+SECRET_FILES = SecretFileCache()
+
+
+class FileBackedSetting(GettableSetting[T]):
+    def __init__(self,
+                 secret_file: SecretFile,
+                 formatter: Callable[[str], T],
+                 default: Optional[T] = None,
+                 required: bool = True,
+                 key: Optional[str] = None):
+        """
+        A loaded setting whose value is read from a file on first get(),
+        and re-read when the file changes.
+        :param secret_file: the file holding the value
+        """
+        super().__init__(None, formatter, default, required, key)
+        self.secret_file: SecretFile = secret_file
+        self.version: int = 0
+
+    def get(self) -> Optional[T]:
+        version, content = _read_file_value(self)
+        if version != self.version:
+            self.value = _parse_file_value(self, content)
+            self.version = version
+        return self.value if version else self.default
+
+
+class FileBackedListSetting(GettableListSetting[T]):
+    def __init__(self,
+                 secret_file: SecretFile,
+                 formatter: Callable[[str], T],
+                 default: Optional[List[T]] = None,
+                 required: bool = True,
+                 key: Optional[str] = None):
+        """
+        A loaded list setting whose value is read from a file on first
+        get(), and re-read when the file changes.
+        :param secret_file: the file holding the value
+        """
+        super().__init__(None, formatter, default, required, key)
+        self.secret_file: SecretFile = secret_file
+        self.version: int = 0
+
+    def get(self) -> Optional[List[T]]:
+        version, content = _read_file_value(self)
+        if version != self.version:
+            self.value = _parse_file_value(self, content)
+            self.version = version
+        return self.value if version else self.default
+
+
+def _read_file_value(setting: Union[FileBackedSetting,
+                                    FileBackedListSetting]) -> \
+        Tuple[int, str]:
+    """
+    :return: the version and content of the setting's file, or version 0
+        if the file has never been readable and the setting has a default
+    """
+    try:
+        return setting.secret_file.read()
+    except OSError as ex:
+        if setting.default is not None:
+            return 0, ''
+        raise ValueError(
+            f"Cannot read value of {setting.key} "
+            f"from {setting.secret_file.path}: {ex}"
+        )
+
+
+def _parse_file_value(setting: Union[FileBackedSetting,
+                                     FileBackedListSetting],
+                      content: str) -> Any:
+    try:
+        return setting.from_raw_value(content)
+    except ValueError as ex:
+        raise ValueError(
+            f"Error parsing value of {setting.key} "
+            f"from {setting.secret_file.path}: {ex}"
+        )
+
+
 CliArgTuple = Tuple[str, Union[str, bool]]
 
 
@@ -238,9 +548,14 @@ def parse_cli_arguments(args: List[str]) -> \
 ##################################################################
 
 class RawSetting(object):
-    def __init__(self, raw_name: str, raw_value: Union[str, bool]):
+    def __init__(self, raw_name: str, raw_value: Any):
+        """
+        :param raw_name: the name the value was found under in its source
+        :param raw_value: a string for text-based sources, or an already
+            typed value (bool, number, list...) for typed sources
+        """
         self.raw_name: str = raw_name
-        self.raw_value: Union[str, bool] = raw_value
+        self.raw_value: Any = raw_value
 
     @staticmethod
     def merge(raw_name: str, raw_settings: List['RawSetting']) -> 'RawSetting':
@@ -331,15 +646,26 @@ class CLISettingsSource(SettingsSource):
 
         if intermediate_results and len(intermediate_results) > 1:
             raise ValueError(f"Multiple forms of {forms[0]} used in CLI "
-                             f"arguments, an illegal combination.")
+                             "arguments, an illegal combination.")
         return intermediate_results[0] if intermediate_results else None
 
 
+@functools.lru_cache(maxsize=None)
 def camel_to_big_snake(name):
     name = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
     return re.sub('([a-z0-9])([A-Z])', r'\1_\2', name).upper()
 
 
+@functools.lru_cache(maxsize=None)
+def env_namespace(namespace: str) -> str:
+    """
+    :param namespace: dotted namespace, e.g. Service.db
+    :return: the environment variable prefix, e.g. SERVICE__DB
+    """
+    return '__'.join(camel_to_big_snake(segment)
+                     for segment in namespace.split('.'))
+
+
 FlexibleEnvironType = Union[os._Environ, Dict[str, str]]
 
 
@@ -368,25 +694,85 @@ class EnvironSettingsSource(SettingsSource):
             local_name = aliases.env_variable
         formatted_name = camel_to_big_snake(local_name)
 
-        forms = []
-
         # fully qualified name
         if namespace:
-            formatted_namespace = camel_to_big_snake(namespace)
-            full_name = f"{formatted_namespace}__{formatted_name}"
+            full_name = f"{env_namespace(namespace)}__{formatted_name}"
             if full_name in self.raw_settings:
-                forms.append(RawSetting(
-                    full_name, self.raw_settings[full_name]))
+                return RawSetting(full_name, self.raw_settings[full_name])
 
         # check for short name
         if formatted_name in self.raw_settings:
-            forms.append(RawSetting(
-                formatted_name,
-                self.raw_settings[formatted_name]))
-        if len(forms) > 0:
-            return forms[0]
-        else:
-            return None
+            return RawSetting(
+                formatted_name, self.raw_settings[formatted_name])
+        return None
+
+    @staticmethod
+    def variable_names(namespace: Optional[str],
+                       canonical_name: str,
+                       aliases: Optional[SettingAliases]) -> List[str]:
+        """
+        :return: environment variable names for a setting, fully qualified
+            name first, then short name
+        """
+        local_name = canonical_name
+        if aliases and aliases.env_variable:
+            local_name = aliases.env_variable
+        formatted_name = camel_to_big_snake(local_name)
+
+        if namespace:
+            return [f"{env_namespace(namespace)}__{formatted_name}",
+                    formatted_name]
+        return [formatted_name]
+
+
+class FileReferenceSettingsSource(SettingsSource):
+    def __init__(self,
+                 environ: FlexibleEnvironType,
+                 cache: Optional[SecretFileCache] = None,
+                 suffix: str = '_FILE'):
+        """
+        Supplies values held in files, such as mounted secrets, from
+        environment variables naming the file (e.g. FOO_FILE=/run/secrets/foo
+        or MY_CONFIG__FOO_FILE) or from a SettingAliases file alias, if the
+        file exists at load. Files are read on first get(), and re-read when
+        they change.
+        :param environ: environment variables
+        :param cache: tracks the files, defaults to SECRET_FILES
+        :param suffix: suffix of environment variables naming files
+        """
+        self.raw_settings = copy.copy(environ)
+        self.cache: SecretFileCache = cache or SECRET_FILES
+        self.suffix: str = suffix
+
+    def get_raw_setting(self,
+                        namespace: Optional[str],
+                        canonical_name: str,
+                        aliases: Optional[SettingAliases],
+                        as_list: bool = False) -> \
+            Optional[RawSetting]:
+        """
+        :param namespace: namespace for config name_or_alias, typically maps to
+            a SettingsDefinition class name
+        :param canonical_name: a string name, sources from either
+            SettingsDefinition property name.
+        :param aliases: options SettingAliases instance, specifies aliases from
+            definition.
+        :param as_list: whether to pull all existing matching values as a list.
+        :return: RawSetting with a SecretFile value if found, else None
+        """
+        # files which do not exist are skipped, so lower precedence sources
+        # and defaults apply
+        for name in EnvironSettingsSource.variable_names(
+                namespace, canonical_name, aliases):
+            name += self.suffix
+            path = self.raw_settings.get(name)
+            if path is not None and os.path.isfile(path):
+                return RawSetting(name, self.cache.file(path))
+
+        # a file alias is a default location, used only if it exists
+        if aliases and aliases.file and os.path.isfile(aliases.file):
+            return RawSetting(canonical_name, self.cache.file(aliases.file))
+        return None
 
 
 class ConfigFileSource(SettingsSource):
@@ -394,7 +780,7 @@ class ConfigFileSource(SettingsSource):
     def from_filename(filename: str) -> 'ConfigFileSource':
         config_parser = configparser.ConfigParser()
         config_parser.read(filename)
-        return ConfigFileSource(config_parser)
+        return ConfigFileSource(config_parser, filename)
 
     @staticmethod
     def from_string(content: str) -> 'ConfigFileSource':
@@ -402,8 +788,10 @@ class ConfigFileSource(SettingsSource):
         config_parser.read_string(content)
         return ConfigFileSource(config_parser)
 
-    def __init__(self, config_parser: configparser.ConfigParser):
+    def __init__(self, config_parser: configparser.ConfigParser,
+                 filename: Optional[str] = None):
         self.config_parser = config_parser
+        self.filename: Optional[str] = filename
 
     def get_raw_setting(self,
                         namespace: Optional[str],
@@ -432,107 +820,608 @@ class ConfigFileSource(SettingsSource):
             return RawSetting(canonical_name, value)
 
 
+class StructuredFileSource(SettingsSource):
+    """
+    Settings source over a mapping of sections to already-typed values,
+    as produced by JSON or TOML documents. Values are passed to settings
+    as-is, skipping the string round trip of ConfigFileSource.
+    """
+    def __init__(self, sections: Dict[str, Any],
+                 filename: Optional[str] = None):
+        self.sections: Dict[str, Any] = sections
+        self.filename: Optional[str] = filename
+        self._namespaces: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def section(self, namespace: str) -> Optional[Dict[str, Any]]:
+        """
+        :param namespace: dotted namespace, e.g. Service.db
+        :return: the section for namespace, either a top-level key named
+            for the whole namespace or nested tables/objects per segment
+        """
+        try:
+            return self._namespaces[namespace]
+        except KeyError:
+            pass
+        section = self.sections.get(namespace)
+        if not isinstance(section, dict):
+            section = self.sections
+            for segment in namespace.split('.'):
+                section = section.get(segment)
+                if not isinstance(section, dict):
+                    section = None
+                    break
+        self._namespaces[namespace] = section
+        return section
+
+    def get_raw_setting(self,
+                        namespace: Optional[str],
+                        canonical_name: str,
+                        aliases: Optional[SettingAliases],
+                        as_list: bool = False) -> \
+            Optional[RawSetting]:
+        """
+        :param namespace: namespace for config name_or_alias, typically maps to
+            a SettingsDefinition class name
+        :param canonical_name: a string name, sources from either
+            SettingsDefinition property name.
+        :param aliases: options SettingAliases instance, specifies aliases from
+            definition. Ignored in this implementation.
+        :param as_list: whether to pull all existing matching values as a list.
+        :return: RawSetting if found, else None
+        """
+        if namespace is None:
+            return None
+
+        section = self.section(namespace)
+        if section is None:
+            return None
+
+        value = section.get(canonical_name)
+        if value is None:
+            return None
+        else:
+            return RawSetting(canonical_name, value)
+
+
+class JsonFileSource(StructuredFileSource):
+    @staticmethod
+    def from_filename(filename: str) -> 'JsonFileSource':
+        with open(filename, 'r') as fh:
+            return JsonFileSource(json.load(fh), filename)
+
+    @staticmethod
+    def from_string(content: str) -> 'JsonFileSource':
+        return JsonFileSource(json.loads(content))
+
+
+class TomlFileSource(StructuredFileSource):
+    @staticmethod
+    def from_filename(filename: str) -> 'TomlFileSource':
+        if tomllib is None:
+            raise ImportError(
+                f"Cannot read {filename}: TOML config files require "
+                f"python 3.11+ or the tomli package"
+            )
+        with open(filename, 'rb') as fh:
+            return TomlFileSource(tomllib.load(fh), filename)
+
+    @staticmethod
+    def from_string(content: str) -> 'TomlFileSource':
+        if tomllib is None:
+            raise ImportError(
+                "TOML config requires python 3.11+ or the tomli package"
+            )
+        return TomlFileSource(tomllib.loads(content))
+
+
+# config file extensions recognized in HEARE_CONFIG_PATH, with the
+# source used to read each. Unrecognized extensions are read as INI.
+CONFIG_FILE_SOURCES: Dict[str, Callable[[str], SettingsSource]] = {
+    '.ini': ConfigFileSource.from_filename,
+    '.json': JsonFileSource.from_filename,
+    '.toml': TomlFileSource.from_filename,
+}
+
+
+def config_file_source(filename: str) -> SettingsSource:
+    extension = os.path.splitext(filename)[1].lower()
+    from_filename = CONFIG_FILE_SOURCES.get(
+        extension, ConfigFileSource.from_filename)
+    return from_filename(filename)
+
+
+class LazySettingsSource(SettingsSource):
+    def __init__(self,
+                 factory: Callable[[], SettingsSource],
+                 filename: Optional[str] = None):
+        """
+        Defers constructing a SettingsSource until a setting is first looked
+        up in it, so config files are only read and parsed when some
+        setting falls through to them.
+        :param factory: builds the underlying SettingsSource
+        :param filename: file backing the source, if any
+        """
+        self.factory: Callable[[], SettingsSource] = factory
+        self.filename: Optional[str] = filename
+        self.source: Optional[SettingsSource] = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.source is not None
+
+    def get_raw_setting(self,
+                        namespace: Optional[str],
+                        canonical_name: str,
+                        aliases: Optional[SettingAliases],
+                        as_list: bool = False) -> \
+            Optional[RawSetting]:
+        """
+        :param namespace: namespace for config name_or_alias, typically maps to
+            a SettingsDefinition class name
+        :param canonical_name: a string name, sources from either
+            SettingsDefinition property name.
+        :param aliases: options SettingAliases instance, specifies aliases from
+            definition.
+        :param as_list: whether to pull all existing matching values as a list.
+        :return: RawSetting if found, else None
+        """
+        if self.source is None:
+            self.source = self.factory()
+        return self.source.get_raw_setting(
+            namespace, canonical_name, aliases, as_list=as_list)
+
+
 class SettingsDefinition(object):
     @staticmethod
     def discover() -> Set[type]:
+        """
+        :return: all SettingsDefinition subclasses, except those declared
+            in the body of another definition, which exist only to be loaded
+            with their parent. Definitions declared elsewhere and assigned
+            as an attribute are still discovered.
+        """
         subclasses: Set[type] = set()
         work = [SettingsDefinition]
         while work:
             parent = work.pop()
             for child in parent.__subclasses__():
+                # classes generated over a loaded definition, such as
+                # tenant views, are not definitions of their own
+                if child.__dict__.get('_generated_view', False):
+                    continue
                 if child not in subclasses:
                     subclasses.add(child)
                     work.append(child)
-        return subclasses
+        inner = {nested_class for definition in subclasses
+                 for _, nested_class in _nested_definitions(definition)
+                 if nested_class.__qualname__.startswith(
+                     definition.__qualname__ + '.')}
+        return subclasses - inner
 
     @classmethod
     def load(cls,
              args: Union[List[str], None] = None,
              env: FlexibleEnvironType = os.environ,
-             config_files: Union[List[str], None] = None):
+             config_files: Union[List[str], None] = None,
+             secret_cache: Optional[SecretFileCache] = None):
+        sources = SettingsDefinition.build_sources(
+            args, env, config_files, secret_cache)
+        return SettingsDefinition.load_for_class(cls, sources)
+
+    @staticmethod
+    def build_sources(args: Union[List[str], None] = None,
+                      env: FlexibleEnvironType = os.environ,
+                      config_files: Union[List[str], None] = None,
+                      secret_cache: Optional[SecretFileCache] = None) -> \
+            List[SettingsSource]:
+        """
+        Build the settings sources used by load().
+        :param args: command line arguments, defaults to sys.argv
+        :param env: environment variables
+        :param config_files: config files, defaults to the files
+            found in HEARE_CONFIG_PATH
+        :param secret_cache: tracks files values are read from, defaults to
+            SECRET_FILES
+        :return: list of SettingsSource, in order of precedence: CLI
+            arguments, environment variables, files named by environment
+            variables or file aliases, then config files with the last
+            specified file first. Config files are opened lazily.
+        """
         sources: List[SettingsSource] = []
 
         if not args:
             args = sys.argv
 
         if not config_files:
-            config_files = []
-            # check environ config
-            # this is a PATH-like string, containing either files or directories
-            # directories are not traversed recursively
-            env_var = os.environ.get('HEARE_CONFIG_PATH', '')
-            parts = env_var.split(os.pathsep)
-            for part in parts:
-                if os.path.isdir(part):
-                    for f in glob.glob(part + os.path.sep + '*.ini'):
-                        config_files.append(f)
-                if os.path.isfile(part):
-                    config_files.append(part)
-
-        for file in config_files:
-            if os.path.exists(file):
-                sources.append(ConfigFileSource.from_filename(file))
+            config_files = SettingsDefinition.config_path_files()
 
-        if env:
-            sources.append(EnvironSettingsSource(env))
         if args:
             sources.append(CLISettingsSource(args))
+        if env:
+            sources.append(EnvironSettingsSource(env))
+        sources.append(FileReferenceSettingsSource(env or {}, secret_cache))
 
-        return SettingsDefinition.load_for_class(cls, sources)
+        for file in reversed(config_files):
+            if os.path.exists(file):
+                sources.append(LazySettingsSource(
+                    functools.partial(config_file_source, file), file))
+
+        return sources
+
+    @staticmethod
+    def config_path_files() -> List[str]:
+        config_files: List[str] = []
+        # check environ config
+        # this is a PATH-like string, containing either files or directories
+        # directories are not traversed recursively
+        env_var = os.environ.get('HEARE_CONFIG_PATH', '')
+        parts = env_var.split(os.pathsep)
+        for part in parts:
+            if os.path.isdir(part):
+                # ordered by filename across formats, so precedence does
+                # not depend on the extension or on glob's ordering
+                for f in sorted(glob.glob(part + os.path.sep + '*')):
+                    extension = os.path.splitext(f)[1].lower()
+                    if extension in CONFIG_FILE_SOURCES:
+                        config_files.append(f)
+            if os.path.isfile(part):
+                config_files.append(part)
+        return config_files
+
+    @staticmethod
+    def load_all(definitions: Optional[Iterable[type]] = None,
+                 args: Union[List[str], None] = None,
+                 env: FlexibleEnvironType = os.environ,
+                 config_files: Union[List[str], None] = None,
+                 secret_cache: Optional[SecretFileCache] = None) -> \
+            Dict[type, Any]:
+        """
+        Load many definitions from one set of sources, sharing resolved
+        interpolation references between them.
+        :param definitions: SettingsDefinition classes to load, defaults to
+            all discovered definitions
+        :return: mapping of definition class to loaded instance
+        """
+        if definitions is None:
+            definitions = SettingsDefinition.discover()
+        definitions = list(definitions)
+        sources = SettingsDefinition.build_sources(
+            args, env, config_files, secret_cache)
+        interpolator = Interpolator(sources, definitions)
+        return {
+            definition: SettingsDefinition.load_for_class(
+                definition, sources, interpolator)
+            for definition in definitions
+        }
 
     @classmethod
     def load_for_class(cls, settings_class,
-                       settings_sources: List[SettingsSource]):
-        result = settings_class()
-        setting_specs = {}
-        intermediate_results: Dict[str, List[RawSetting]] = dict()
-
-        for name, value in settings_class.__dict__.items():
-            if not (isinstance(value, Setting)
-                    or isinstance(value, ListSetting)):
-                continue
+                       settings_sources: List[SettingsSource],
+                       interpolator: Optional['Interpolator'] = None):
+        """
+        :param settings_class: the SettingsDefinition subclass to load
+        :param settings_sources: sources in order of precedence; each
+            setting takes its value from the first source that supplies one
+        :param interpolator: resolves ${Namespace.name} references, created
+            on demand if not given
+        :return: a hydrated instance of settings_class
+        """
+        return _hydrate(settings_class, settings_sources, interpolator)
+
+
+AnySetting = Union[Setting, ListSetting]
+Hydrator = Callable[..., Any]
+
+# Specialized loaders, one per SettingsDefinition class. The generated
+# functions never reference their class, so entries vanish with it.
+_HYDRATORS: 'weakref.WeakKeyDictionary[type, Hydrator]' = \
+    weakref.WeakKeyDictionary()
+
+
+def _hydrate(settings_class: type,
+             settings_sources: List[SettingsSource],
+             interpolator: Optional['Interpolator'] = None,
+             namespace: Optional[str] = None) -> Any:
+    hydrate = _HYDRATORS.get(settings_class)
+    if hydrate is None:
+        hydrate = _compile_hydrator(settings_class)
+        _HYDRATORS[settings_class] = hydrate
+    if namespace is None:
+        return hydrate(settings_class(), settings_sources, interpolator)
+    return hydrate(settings_class(), settings_sources, interpolator,
+                   namespace)
+
+
+def _setting_specs(settings_class: type) -> List[Tuple[str, AnySetting]]:
+    return [(name, value) for name, value in settings_class.__dict__.items()
+            if isinstance(value, (Setting, ListSetting))]
+
+
+def _nested_definitions(settings_class: type) -> List[Tuple[str, type]]:
+    """
+    :return: (attribute name, definition) of SettingsDefinitions nested in
+        settings_class, whose namespace is <parent namespace>.<attribute>
+    """
+    return [(name, value) for name, value in settings_class.__dict__.items()
+            if isinstance(value, type)
+            and issubclass(value, SettingsDefinition)]
+
+
+def _check_nesting(settings_class: type,
+                   path: Optional[List[Tuple[type, str]]] = None) -> None:
+    """
+    :raises ValueError: if definitions nest each other in a cycle, e.g.
+        A.b = B and B.a = A, which could never finish loading
+    """
+    path = path or []
+    for name, nested_class in _nested_definitions(settings_class):
+        trail = path + [(settings_class, name)]
+        if nested_class in [definition for definition, _ in trail]:
+            raise ValueError(
+                "Circular nesting of SettingsDefinitions: "
+                + " -> ".join(f"{definition.__name__}.{attribute}"
+                              for definition, attribute in trail)
+                + f" -> {nested_class.__name__}"
+            )
+        _check_nesting(nested_class, trail)
+
+
+def _setting_keys(settings_class: type,
+                  namespace: Optional[str] = None) -> List[str]:
+    """
+    :return: fully qualified keys, <namespace>.<name>, of all settings of
+        settings_class and of definitions nested in it
+    """
+    if namespace is None:
+        _check_nesting(settings_class)
+        namespace = settings_class.__name__
+    keys = [f"{namespace}.{name}"
+            for name, _ in _setting_specs(settings_class)]
+    for name, nested_class in _nested_definitions(settings_class):
+        keys += _setting_keys(nested_class, f"{namespace}.{name}")
+    return keys
+
+
+def first_raw_setting(settings_sources: List[SettingsSource],
+                      namespace: str,
+                      name: str,
+                      spec: AnySetting) -> Optional[RawSetting]:
+    """
+    :return: the RawSetting of the highest precedence source supplying a
+        value, else None
+    """
+    as_list = isinstance(spec, ListSetting)
+    for source in settings_sources:
+        raw_setting = source.get_raw_setting(
+            namespace, name, spec.aliases, as_list=as_list)
+        if raw_setting is not None:
+            return raw_setting
+    return None
+
+
+# ${Namespace.name} references a setting, $${...} escapes a literal ${...}
+_INTERPOLATION = re.compile(r'\$(\$?)\{([^{}]*)\}')
+
+
+class Interpolator(object):
+    def __init__(self,
+                 settings_sources: List[SettingsSource],
+                 definitions: Optional[Iterable[type]] = None):
+        """
+        Resolves ${Namespace.name} references in raw setting values, where
+        Namespace is a SettingsDefinition class name. Referenced settings
+        are resolved from the same sources, recursively, and each is
+        resolved at most once per Interpolator, so values are fixed for
+        the lifetime of a load. File-backed settings cannot be referenced.
+        :param settings_sources: sources in order of precedence
+        :param definitions: SettingsDefinition classes references may
+            name, consulted before all discovered definitions
+        """
+        self.settings_sources: List[SettingsSource] = settings_sources
+        self.definitions: List[type] = list(definitions or [])
+        # resolved value of every setting visited
+        self.resolved: Dict[Tuple[str, str], str] = {}
+        self._resolving: List[Tuple[str, str]] = []
 
-            setting_specs[name] = (name, value)
-            intermediate_results[name] = []
+    def interpolate(self, namespace: str, name: str, value: str) -> str:
+        """
+        :param namespace: namespace of the setting the value belongs to
+        :param name: name of the setting the value belongs to
+        :param value: a raw value possibly containing references
+        :return: the value with all references substituted
+        """
+        key = (namespace, name)
+        if key in self.resolved:
+            return self.resolved[key]
+        if key in self._resolving:
+            cycle = self._resolving[self._resolving.index(key):] + [key]
+            raise ValueError(
+                "Circular interpolation: "
+                + " -> ".join(f"{ns}.{n}" for ns, n in cycle)
+            )
 
-            for source in settings_sources:
-                raw_setting: Optional[RawSetting] = source.get_raw_setting(
-                    settings_class.__name__, name, value.aliases,
-                    as_list=isinstance(value, ListSetting))
+        self._resolving.append(key)
+        try:
+            result = _INTERPOLATION.sub(self._substitute, value)
+        finally:
+            self._resolving.pop()
+        self.resolved[key] = result
+        return result
 
-                if raw_setting:
-                    intermediate_results[name].append(raw_setting)
+    def _substitute(self, match: typing.Match) -> str:
+        escape, reference = match.groups()
+        if escape:
+            return '${' + reference + '}'
+        namespace, _, name = reference.rpartition('.')
+        if not namespace or not name:
+            raise ValueError(
+                f"Invalid interpolation ${{{reference}}}, "
+                f"expected ${{Namespace.name}}"
+            )
+        return self.resolve(namespace, name)
 
-        # apply intermediate results to a fully hydrated config object
-        for name, (_, setting_spec) in setting_specs.items():
-            setting_candidates = intermediate_results.get(name, [])
+    def resolve(self, namespace: str, name: str) -> str:
+        """
+        :return: the interpolated raw value of setting namespace.name, or
+            its default as a string if no source supplies one. Defaults
+            are not interpolated, as when loading the setting itself.
+        """
+        key = (namespace, name)
+        if key in self.resolved:
+            return self.resolved[key]
+
+        spec = self._find_spec(namespace, name)
+        raw_setting = first_raw_setting(
+            self.settings_sources, namespace, name, spec)
+        if raw_setting is not None:
+            value = raw_setting.raw_value
+        elif spec.default is not None:
+            value = spec.default
+            if isinstance(value, (list, tuple)):
+                value = ','.join(str(part) for part in value)
+            self.resolved[key] = str(value)
+            return self.resolved[key]
+        else:
+            raise ValueError(
+                f"Unresolved interpolation ${{{namespace}.{name}}}: "
+                f"no value configured"
+            )
 
-            if setting_spec.required and \
-                    not (setting_candidates or setting_spec.default):
-                raise ValueError(
-                    f"Required config not satisfied: {name}, {setting_spec}"
-                )
+        if isinstance(value, SecretFile):
+            # a derived value would keep the content read at load, and
+            # not follow rotation of the file
+            raise ValueError(
+                f"Cannot interpolate ${{{namespace}.{name}}}: its value is "
+                f"read from {value.path} on get(), not at load"
+            )
+        if isinstance(value, str):
+            return self.interpolate(namespace, name, value)
+        if isinstance(value, (list, tuple)):
+            value = ','.join(str(part) for part in value)
+        self.resolved[key] = str(value)
+        return self.resolved[key]
+
+    def _find_spec(self, namespace: str, name: str) -> AnySetting:
+        root, *path = namespace.split('.')
+        candidates = [definition for definition in self.definitions
+                      if definition.__name__ == root]
+        if not candidates:
+            candidates = [definition
+                          for definition in SettingsDefinition.discover()
+                          if definition.__name__ == root]
+        for segment in path:
+            candidates = [nested_class for definition in candidates
+                          for nested_name, nested_class
+                          in _nested_definitions(definition)
+                          if nested_name == segment]
+        specs = [spec for definition in candidates
+                 for spec_name, spec in _setting_specs(definition)
+                 if spec_name == name]
+        if not specs:
+            raise ValueError(
+                f"Unknown setting in interpolation ${{{namespace}.{name}}}")
+        if len(specs) > 1:
+            raise ValueError(
+                f"Ambiguous interpolation ${{{namespace}.{name}}}: "
+                f"{len(specs)} definitions named {namespace} declare {name}"
+            )
+        return specs[0]
+
+
+def _compile_hydrator(settings_class: type) -> Hydrator:
+    """
+    Generate a loader specialized to a single SettingsDefinition class,
+    in the manner of dataclasses' generated __init__. Setting names,
+    specs, parsers and defaults are bound as constants of the generated
+    function, so a load only queries sources and parses values.
+    :param settings_class: the SettingsDefinition subclass to specialize
+    :return: function hydrating an instance from a list of sources
+    """
+    _check_nesting(settings_class)
+    class_name = settings_class.__name__
+    constants: Dict[str, Any] = {
+        '_default_namespace': class_name,
+        '_hydrate': _hydrate,
+        '_str': str,
+        '_ValueError': ValueError,
+        '_Interpolator': Interpolator,
+        '_SecretFile': SecretFile,
+    }
+    collect: List[str] = []
+    apply: List[str] = []
+    for idx, (name, spec) in enumerate(_setting_specs(settings_class)):
+        constants[f'_name_{idx}'] = name
+        constants[f'_aliases_{idx}'] = spec.aliases
+        constants[f'_default_{idx}'] = spec.default
+        constants[f'_parse_{idx}'] = spec.from_raw_value
+        constants[f'_gettable_{idx}'] = spec.to_gettable
+        constants[f'_file_gettable_{idx}'] = spec.to_file_gettable
+        constants[f'_required_{idx}'] = \
+            f"Required config not satisfied: {name}, {spec}"
+        as_list = isinstance(spec, ListSetting)
+
+        # sources are in precedence order; stop at the first answer
+        collect += [
+            f"    _raw_{idx} = None",
+            "    for _source in _sources:",
+            f"        _raw_{idx} = _source.get_raw_setting(",
+            f"            _namespace, _name_{idx}, _aliases_{idx},",
+            f"            as_list={as_list})",
+            f"        if _raw_{idx} is not None:",
+            "            break",
+        ]
 
-            if setting_candidates:
-                if isinstance(setting_candidates[0].raw_value, bool):
-                    value = setting_candidates[0].raw_value
-                else:
-                    try:
-                        value = setting_spec.from_raw_value(
-                            setting_candidates[0].raw_value
-                        )
-                    except ValueError as ex:
-                        raise ValueError(
-                            f"Error parsing value of {result.__class__.__name__}.{name}: {ex}"
-                        )
-            else:
-                value = setting_spec.default
+        if name.isidentifier() and not keyword.iskeyword(name):
+            assign = f"        _result.{name} = {{}}"
+        else:
+            assign = f"        setattr(_result, _name_{idx}, {{}})"
 
-            setattr(
-                result,
-                name, setting_spec.to_gettable(
-                    value
-                )
-            )
+        apply += [f"    _key = _prefix + _name_{idx}",
+                  f"    if _raw_{idx} is None:"]
+        if spec.required and not spec.default:
+            apply += [f"        raise _ValueError(_required_{idx})"]
+        else:
+            apply += [assign.format(
+                f"_gettable_{idx}(_default_{idx}, _key)")]
+        apply += [
+            # files are read on first get(), not at load
+            f"    elif _raw_{idx}.raw_value.__class__ is _SecretFile:",
+            assign.format(
+                f"_file_gettable_{idx}(_raw_{idx}.raw_value, _key)"),
+            "    else:",
+            f"        _value = _raw_{idx}.raw_value",
+            "        if _value.__class__ is _str and '${' in _value:",
+            "            if _interpolator is None:",
+            "                _interpolator = _Interpolator(",
+            "                    _sources, [_result.__class__])",
+            "            _value = _interpolator.interpolate(",
+            f"                _namespace, _name_{idx}, _value)",
+            "        try:",
+            f"            _value = _parse_{idx}(_value)",
+            "        except _ValueError as _ex:",
+            "            raise _ValueError(",
+            "                'Error parsing value of ' + _key + ': '",
+            "                + str(_ex))",
+            assign.format(f"_gettable_{idx}(_value, _key)"),
+        ]
 
-        return result
+    # nested definitions are loaded under <namespace>.<attribute>
+    for idx, (name, nested_class) in enumerate(
+            _nested_definitions(settings_class)):
+        constants[f'_nested_name_{idx}'] = name
+        constants[f'_nested_{idx}'] = nested_class
+        apply += [
+            f"    setattr(_result, _nested_name_{idx}, _hydrate(",
+            f"        _nested_{idx}, _sources, _interpolator,",
+            f"        _prefix + _nested_name_{idx}))",
+        ]
+
+    source = '\n'.join(
+        ["def hydrate(_result, _sources, _interpolator=None,",
+         "            _namespace=_default_namespace):",
+         "    _prefix = _namespace + '.'"]
+        + collect + apply + ["    return _result"]
+    )
+    exec(compile(source, f"<heare.config hydrate {class_name}>", 'exec'),
+         constants)
+    return constants['hydrate']
@@ -0,0 +1,254 @@
+"""
+Diagnostic entry point for heare.config.
+
+Imports the given modules, loads every discovered SettingsDefinition and
+prints each resolved value with the source it was resolved from, followed
+by per-source and per-definition load timings.
+
+    python -m heare.config -m myapp.settings -- --MyConfig.foo=bar
+    python -m heare.config -m myapp.settings --repeat 1000
+"""
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Set, TextIO, Tuple
+
+from heare.config import SettingsDefinition, SettingsSource, \
+    SettingAliases, RawSetting, FileBackedSetting, FileBackedListSetting, \
+    _nested_definitions, _setting_specs
+
+DEFAULT_SOURCE = 'default'
+
+
+class TimedSettingsSource(SettingsSource):
+    def __init__(self, source: SettingsSource):
+        """
+        Wraps a SettingsSource, accumulating the time spent in lookups
+        and recording which settings it was able to supply.
+        :param source: the SettingsSource to wrap
+        """
+        self.source: SettingsSource = source
+        self.seconds: float = 0.0
+        self.lookups: int = 0
+        self.hits: Set[Tuple[Optional[str], str]] = set()
+
+    @property
+    def label(self) -> str:
+        filename = getattr(self.source, 'filename', None)
+        return filename or self.source.__class__.__name__
+
+    def get_raw_setting(self,
+                        namespace: Optional[str],
+                        canonical_name: str,
+                        aliases: Optional[SettingAliases],
+                        as_list: bool = False) -> \
+            Optional[RawSetting]:
+        start = time.perf_counter()
+        try:
+            result = self.source.get_raw_setting(
+                namespace, canonical_name, aliases, as_list=as_list)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.lookups += 1
+        if result is not None:
+            self.hits.add((namespace, canonical_name))
+        return result
+
+
+def winning_source(sources: List[TimedSettingsSource],
+                   namespace: str, name: str) -> str:
+    """
+    :return: label of the source a setting was resolved from, matching
+        the precedence applied by SettingsDefinition.load_for_class
+    """
+    for source in sources:
+        if (namespace, name) in source.hits:
+            return source.label
+    return DEFAULT_SOURCE
+
+
+def import_modules(modules: List[str]) -> float:
+    start = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    return time.perf_counter() - start
+
+
+def select_definitions(names: List[str]) -> List[type]:
+    definitions = sorted(SettingsDefinition.discover(),
+                         key=lambda d: (d.__module__, d.__qualname__))
+    if names:
+        definitions = [d for d in definitions if d.__name__ in names]
+    return definitions
+
+
+def load_all(definitions: List[type],
+             sources: List[SettingsSource]) -> \
+        Tuple[Dict[type, Any], Dict[type, float], Dict[type, Exception]]:
+    results: Dict[type, Any] = {}
+    timings: Dict[type, float] = {}
+    errors: Dict[type, Exception] = {}
+    for definition in definitions:
+        start = time.perf_counter()
+        try:
+            results[definition] = SettingsDefinition.load_for_class(
+                definition, sources)
+        except ValueError as ex:
+            errors[definition] = ex
+        timings[definition] = time.perf_counter() - start
+    return results, timings, errors
+
+
+def print_settings(definition: type,
+                   loaded: Any,
+                   namespace: str,
+                   sources: List[TimedSettingsSource],
+                   out: TextIO,
+                   indent: str = '  ') -> None:
+    for name, _ in _setting_specs(definition):
+        setting = getattr(loaded, name)
+        label = winning_source(sources, namespace, name)
+        if isinstance(setting, (FileBackedSetting, FileBackedListSetting)):
+            # values from files are typically secrets, never print them
+            print(f"{indent}{name} = <file {setting.secret_file.path}>"
+                  f"  <{label}>", file=out)
+        else:
+            print(f"{indent}{name} = {setting.get()!r}  <{label}>", file=out)
+    for name, nested_class in _nested_definitions(definition):
+        print(f"{indent}[{namespace}.{name}]", file=out)
+        print_settings(nested_class, getattr(loaded, name),
+                       f"{namespace}.{name}", sources, out, indent + '  ')
+
+
+def format_ms(seconds: float) -> str:
+    return f"{seconds * 1000:10.3f} ms"
+
+
+def report(definitions: List[type],
+           args: List[str],
+           config_files: Optional[List[str]],
+           import_seconds: float,
+           out: TextIO) -> int:
+    start = time.perf_counter()
+    sources = [TimedSettingsSource(source) for source in
+               SettingsDefinition.build_sources(
+                   args, os.environ, config_files)]
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results, timings, errors = load_all(definitions, list(sources))
+    load_seconds = time.perf_counter() - start
+
+    for definition in definitions:
+        namespace = definition.__name__
+        print(f"[{definition.__module__}.{definition.__qualname__}]",
+              file=out)
+        if definition in errors:
+            print(f"  ERROR: {errors[definition]}", file=out)
+            continue
+        print_settings(definition, results[definition], namespace,
+                       sources, out)
+
+    print("", file=out)
+    print("timings", file=out)
+    print(f"  {'import':<40}{format_ms(import_seconds)}", file=out)
+    print(f"  {'build sources':<40}{format_ms(build_seconds)}", file=out)
+    print(f"  {'load':<40}{format_ms(load_seconds)}", file=out)
+    print("  per source:", file=out)
+    for timed_source in sources:
+        print(f"    {timed_source.label:<38}"
+              f"{format_ms(timed_source.seconds)}"
+              f"  {timed_source.lookups} lookups", file=out)
+    print("  per definition:", file=out)
+    for definition in definitions:
+        print(f"    {definition.__name__:<38}"
+              f"{format_ms(timings[definition])}", file=out)
+
+    return 1 if errors else 0
+
+
+def benchmark(definitions: List[type],
+              args: List[str],
+              config_files: Optional[List[str]],
+              repeat: int,
+              out: TextIO) -> int:
+    # failing loads stop early, so timing them would be misleading
+    sources = SettingsDefinition.build_sources(args, os.environ, config_files)
+    _, _, errors = load_all(definitions, sources)
+    for definition, error in errors.items():
+        print(f"{definition.__name__}: ERROR: {error}", file=out)
+    if errors:
+        return 1
+
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sources = SettingsDefinition.build_sources(
+            args, os.environ, config_files)
+        load_all(definitions, sources)
+        samples.append(time.perf_counter() - start)
+
+    print(f"{len(definitions)} definitions, {repeat} loads", file=out)
+    print(f"  {'min':<10}{format_ms(min(samples))}", file=out)
+    print(f"  {'median':<10}{format_ms(statistics.median(samples))}",
+          file=out)
+    print(f"  {'mean':<10}{format_ms(statistics.mean(samples))}", file=out)
+    print(f"  {'max':<10}{format_ms(max(samples))}", file=out)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None,
+         out: TextIO = sys.stdout) -> int:
+    """
+    :param argv: tool arguments; arguments after a '--' separator are
+        passed to the settings sources as command line arguments
+    :param out: stream the report is written to
+    :return: process exit status, non-zero if any definition failed to load
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    settings_args: List[str] = []
+    if '--' in argv:
+        separator = argv.index('--')
+        argv, settings_args = argv[:separator], argv[separator + 1:]
+
+    parser = argparse.ArgumentParser(
+        prog='python -m heare.config',
+        description='Load SettingsDefinitions and report resolved values '
+                    'and load timings.')
+    parser.add_argument('-m', '--module', action='append', default=[],
+                        help='module to import before discovery, '
+                             'may be repeated')
+    parser.add_argument('-d', '--definition', action='append', default=[],
+                        help='only load definitions with this class name, '
+                             'may be repeated')
+    parser.add_argument('-c', '--config', action='append', default=None,
+                        help='config file to load, may be repeated. '
+                             'Defaults to HEARE_CONFIG_PATH')
+    parser.add_argument('-r', '--repeat', type=int, default=0,
+                        help='benchmark steady-state load latency '
+                             'over this many loads')
+    options = parser.parse_args(argv)
+
+    # load() falls back to sys.argv on empty arguments, which would read
+    # the tool's own arguments as settings; a bare positional prevents it
+    settings_args = settings_args or [parser.prog]
+
+    import_seconds = import_modules(options.module)
+    definitions = select_definitions(options.definition)
+    if options.definition and not definitions:
+        print(f"No SettingsDefinition named "
+              f"{', '.join(options.definition)} was found", file=out)
+        return 1
+    if options.repeat > 0:
+        return benchmark(definitions, settings_args, options.config,
+                         options.repeat, out)
+    return report(definitions, settings_args, options.config,
+                  import_seconds, out)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""
+Built-in formatters for common setting types.
+
+Each formatter is a callable accepted anywhere a formatter is, e.g.
+Setting(duration) or ListSetting(byte_size). Parsers are precompiled at
+import time, and ListSetting parses all elements of a value with a single
+call to Formatter.parse_many.
+"""
+import datetime
+import decimal
+import enum
+import re
+from abc import ABCMeta, abstractmethod
+from typing import Any, Dict, Generic, Iterable, List, Type, TypeVar
+
+T = TypeVar('T')
+E = TypeVar('E', bound=enum.Enum)
+
+
+class Formatter(Generic[T], metaclass=ABCMeta):
+    # reported in parse errors, mirroring the builtin type formatters
+    __name__: str = 'formatter'
+
+    @abstractmethod
+    def __call__(self, value: Any) -> T:
+        """
+        :param value: a string, or an already typed value from a typed
+            settings source
+        :return: the parsed value
+        :raises ValueError: if the value cannot be parsed
+        """
+        raise NotImplementedError()
+
+    def parse_many(self, values: Iterable[Any]) -> List[T]:
+        return [self(value) for value in values]
+
+    def parse_csv(self, value: str) -> List[T]:
+        return self.parse_many(value.split(','))
+
+
+def _case_variants(words: Iterable[str]) -> Iterable[str]:
+    for word in words:
+        yield word
+        yield word.upper()
+        yield word.title()
+
+
+_TRUE_WORDS = ('true', 't', 'yes', 'y', 'on', '1')
+_FALSE_WORDS = ('false', 'f', 'no', 'n', 'off', '0', '')
+
+
+class BooleanFormatter(Formatter[bool]):
+    __name__ = 'bool'
+
+    def __init__(self) -> None:
+        self.table: Dict[str, bool] = {}
+        for word in _case_variants(_TRUE_WORDS):
+            self.table[word] = True
+        for word in _case_variants(_FALSE_WORDS):
+            self.table[word] = False
+
+    def __call__(self, value: Any) -> bool:
+        if value.__class__ is bool:
+            return value
+        try:
+            return self.table[value]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return self.table[value.strip().lower()]
+        except (KeyError, AttributeError):
+            raise ValueError(f"{value!r} is not a boolean")
+
+    def parse_many(self, values: Iterable[Any]) -> List[bool]:
+        table = self.table
+        try:
+            return [table[value] for value in values]
+        except (KeyError, TypeError):
+            return [self(value) for value in values]
+
+
+_NUMBER = r'(\d+(?:\.\d*)?|\.\d+)'
+_DURATION_UNITS: Dict[str, float] = {
+    'w': 7 * 24 * 60 * 60,
+    'd': 24 * 60 * 60,
+    'h': 60 * 60,
+    'm': 60,
+    's': 1,
+    'ms': 1e-3,
+    'us': 1e-6,
+    'µs': 1e-6,
+}
+_DURATION_PART = re.compile(r'\s*' + _NUMBER + r'\s*(ms|us|µs|[wdhms])\s*')
+_split_duration = _DURATION_PART.split
+
+
+class DurationFormatter(Formatter[datetime.timedelta]):
+    """
+    Parses durations such as "90", "1.5s", "500ms" or "1h 30m" into
+    timedeltas. Bare numbers are seconds; units are w, d, h, m, s, ms
+    and us.
+    """
+    __name__ = 'duration'
+
+    def __call__(self, value: Any) -> datetime.timedelta:
+        if value.__class__ is not str:
+            return self.from_typed(value)
+        if value.isdigit():
+            return datetime.timedelta(seconds=int(value))
+
+        # splitting on the unit pattern yields [gap, amount, unit, gap...];
+        # the value is well formed when every gap is empty
+        pieces = _split_duration(value)
+        count = len(pieces)
+        if count == 4 and not pieces[0] and not pieces[3]:
+            return datetime.timedelta(
+                0, float(pieces[1]) * _DURATION_UNITS[pieces[2]])
+        if count > 1 and not any(pieces[0::3]):
+            seconds = 0.0
+            units = _DURATION_UNITS
+            for idx in range(1, count, 3):
+                seconds += float(pieces[idx]) * units[pieces[idx + 1]]
+            return datetime.timedelta(0, seconds)
+
+        try:
+            return datetime.timedelta(seconds=float(value))
+        except ValueError:
+            raise ValueError(f"{value!r} is not a duration")
+
+    def from_typed(self, value: Any) -> datetime.timedelta:
+        if isinstance(value, datetime.timedelta):
+            return value
+        if isinstance(value, (int, float)) and value.__class__ is not bool:
+            return datetime.timedelta(seconds=value)
+        return self(str(value))
+
+
+_BYTE_UNIT_CHARS = ' \tbBiIkKmMgGtTpPeE'
+_BYTE_MULTIPLIERS: Dict[str, int] = {'': 1, 'b': 1}
+for _exponent, _prefix in enumerate('kmgtpe', start=1):
+    _BYTE_MULTIPLIERS[_prefix] = 1024 ** _exponent
+    _BYTE_MULTIPLIERS[_prefix + 'i'] = 1024 ** _exponent
+    _BYTE_MULTIPLIERS[_prefix + 'ib'] = 1024 ** _exponent
+    _BYTE_MULTIPLIERS[_prefix + 'b'] = 1000 ** _exponent
+
+
+class ByteSizeFormatter(Formatter[int]):
+    """
+    Parses sizes such as "512", "64KiB", "1.5GB" or "10M" into a number of
+    bytes. SI suffixes (kB, MB, GB...) are powers of 1000, IEC suffixes
+    (KiB, MiB, GiB...) and bare letters (K, M, G...) are powers of 1024.
+    Fractional amounts are accepted only where they come to a whole number
+    of bytes, e.g. "1.5KiB" but not "1.5".
+    """
+    __name__ = 'byte_size'
+
+    def __call__(self, value: Any) -> int:
+        if isinstance(value, int) and value.__class__ is not bool:
+            return value
+        if not isinstance(value, str):
+            raise ValueError(f"{value!r} is not a byte size")
+        if value.isdigit():
+            return int(value)
+
+        amount = value.rstrip(_BYTE_UNIT_CHARS)
+        multiplier = _BYTE_MULTIPLIERS.get(
+            value[len(amount):].strip().lower())
+        amount = amount.strip()
+        if multiplier is not None:
+            if amount.isdigit():
+                return int(amount) * multiplier
+            if _NUMBER_ONLY.fullmatch(amount):
+                size = decimal.Decimal(amount) * multiplier
+                if size == size.to_integral_value():
+                    return int(size)
+                raise ValueError(f"{value!r} is not a whole number of bytes")
+        raise ValueError(f"{value!r} is not a byte size")
+
+
+_NUMBER_ONLY = re.compile(_NUMBER)
+
+
+class DateTimeFormatter(Formatter[datetime.datetime]):
+    """
+    Parses ISO 8601 timestamps, including a trailing "Z" for UTC.
+    """
+    __name__ = 'datetime'
+
+    def __call__(self, value: Any) -> datetime.datetime:
+        if isinstance(value, datetime.datetime):
+            return value
+        value = value.strip()
+        if value.endswith(('Z', 'z')):
+            value = value[:-1] + '+00:00'
+        return datetime.datetime.fromisoformat(value)
+
+
+class EnumFormatter(Formatter[E]):
+    def __init__(self, enum_class: Type[E]):
+        """
+        Parses enum members by name or by value, case-insensitively.
+        :param enum_class: the Enum subclass to parse members of
+        """
+        self.enum_class: Type[E] = enum_class
+        self.__name__ = enum_class.__name__
+        self.table: Dict[str, E] = {}
+        for member in enum_class:
+            for key in (str(member.value), member.name):
+                self.table.setdefault(key, member)
+                self.table.setdefault(key.lower(), member)
+
+    def __call__(self, value: Any) -> E:
+        if isinstance(value, self.enum_class):
+            return value
+        try:
+            return self.table[value]
+        except (KeyError, TypeError):
+            pass
+        try:
+            return self.table[str(value).strip().lower()]
+        except KeyError:
+            raise ValueError(
+                f"{value!r} is not a member of {self.enum_class.__name__}")
+
+
+boolean = BooleanFormatter()
+duration = DurationFormatter()
+byte_size = ByteSizeFormatter()
+iso_datetime = DateTimeFormatter()
+
+
+def enum_of(enum_class: Type[E]) -> EnumFormatter[E]:
+    return EnumFormatter(enum_class)
@@ -0,0 +1,232 @@
+"""
+Optional access accounting for loaded settings, to find settings that
+are never read and settings read in hot paths.
+
+    from heare.config import telemetry
+
+    telemetry.enable(sample_rate=100)
+    telemetry.dump_at_exit('/tmp/settings-access.json')
+    ...
+    telemetry.snapshot()  # {'MyConfig.foo': 1200, ...}
+    telemetry.unread()    # ['MyConfig.unused', ...]
+
+While disabled, GettableSetting.get() is untouched, so there is no cost.
+enable() swaps in a counting get() which increments thread-local
+counters, optionally sampling one in every sample_rate reads. Whether a
+setting has been read at all is recorded exactly, regardless of sampling.
+Counters of finished threads are folded into a shared total.
+"""
+import atexit
+import itertools
+import json
+import sys
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, \
+    TextIO, Tuple
+
+from heare.config import GettableSetting, GettableListSetting, \
+    FileBackedSetting, FileBackedListSetting, SettingsDefinition, \
+    _setting_keys
+
+INSTRUMENTED: List[type] = [GettableSetting, GettableListSetting,
+                            FileBackedSetting, FileBackedListSetting]
+
+_lock = threading.Lock()
+_local = threading.local()
+# counters and read keys of live threads that have read a setting, merged
+# on export, and the totals of threads which have since finished
+_thread_counters: Dict[int, Tuple[Dict[str, int], Set[str]]] = {}
+_thread_ids = itertools.count()
+_finished_counts: Dict[str, int] = {}
+_finished_reads: Set[str] = set()
+_original_gets: Dict[type, Callable[[Any], Any]] = {}
+_sample_rate = 1
+_dump_registered = False
+_dump_path: Optional[str] = None
+
+
+class _ThreadCounters(object):
+    """
+    Held only by the thread-local, so it is collected when its thread
+    finishes, folding the thread's counts into the shared totals.
+    """
+    def __init__(self) -> None:
+        self.id: int = next(_thread_ids)
+        self.counters: Dict[str, int] = {}
+        self.read: Set[str] = set()
+        with _lock:
+            _thread_counters[self.id] = (self.counters, self.read)
+        weakref.finalize(self, _thread_finished, self.id)
+
+
+def _thread_finished(thread_id: int) -> None:
+    with _lock:
+        entry = _thread_counters.pop(thread_id, None)
+        if entry is None:
+            return
+        counters, read = entry
+        for key, count in counters.items():
+            _finished_counts[key] = _finished_counts.get(key, 0) + count
+        _finished_reads.update(read)
+
+
+def _thread_local_counters() -> None:
+    thread_counters = _ThreadCounters()
+    _local.thread_counters = thread_counters
+    _local.counters = thread_counters.counters
+    _local.read = thread_counters.read
+    _local.countdown = _sample_rate
+
+
+def _record(key: str) -> None:
+    try:
+        read = _local.read
+    except AttributeError:
+        _thread_local_counters()
+        read = _local.read
+    if key not in read:
+        read.add(key)
+    countdown = _local.countdown - 1
+    if countdown:
+        _local.countdown = countdown
+        return
+    _local.countdown = _sample_rate
+    counters = _local.counters
+    counters[key] = counters.get(key, 0) + _sample_rate
+
+
+def _counting(get: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    def counting_get(self):
+        key = self.key
+        if key is not None:
+            _record(key)
+        return get(self)
+
+    counting_get.__wrapped__ = get  # type: ignore
+    return counting_get
+
+
+def enable(sample_rate: int = 1) -> None:
+    """
+    Start counting reads of loaded settings.
+    :param sample_rate: count one in every sample_rate reads per thread,
+        reported counts are scaled back up by the same factor
+    """
+    global _sample_rate
+    if sample_rate < 1:
+        raise ValueError(f"sample_rate must be positive, got {sample_rate}")
+    with _lock:
+        _sample_rate = sample_rate
+        for cls in INSTRUMENTED:
+            if cls not in _original_gets:
+                _original_gets[cls] = cls.__dict__['get']
+                setattr(cls, 'get', _counting(_original_gets[cls]))
+
+
+def disable() -> None:
+    """
+    Stop counting reads, restoring the original get() methods. Counts
+    recorded so far are kept until reset().
+    """
+    with _lock:
+        for cls, get in _original_gets.items():
+            setattr(cls, 'get', get)
+        _original_gets.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_original_gets)
+
+
+def reset() -> None:
+    with _lock:
+        for counters, read in _thread_counters.values():
+            counters.clear()
+            read.clear()
+        _finished_counts.clear()
+        _finished_reads.clear()
+
+
+def snapshot() -> Dict[str, int]:
+    """
+    :return: estimated reads per setting key, <namespace>.<name>, merged
+        across threads
+    """
+    with _lock:
+        thread_counters = [counters.copy()
+                           for counters, _ in _thread_counters.values()]
+        thread_counters.append(_finished_counts.copy())
+    merged: Dict[str, int] = {}
+    for counters in thread_counters:
+        for key, count in counters.items():
+            merged[key] = merged.get(key, 0) + count
+    return merged
+
+
+def hot(threshold: int) -> List[Tuple[str, int]]:
+    """
+    :param threshold: minimum number of reads
+    :return: (key, reads) of settings read at least threshold times,
+        most read first
+    """
+    counts = [(key, count) for key, count in snapshot().items()
+              if count >= threshold]
+    return sorted(counts, key=lambda item: (-item[1], item[0]))
+
+
+def unread(definitions: Optional[Iterable[type]] = None) -> List[str]:
+    """
+    :param definitions: SettingsDefinition classes to check, defaults to
+        all discovered definitions
+    :return: keys of settings which have not been read, exactly, even
+        when reads are sampled
+    """
+    if definitions is None:
+        definitions = SettingsDefinition.discover()
+    with _lock:
+        read = set(_finished_reads)
+        for _, thread_read in _thread_counters.values():
+            read.update(thread_read)
+    keys = [key for definition in definitions
+            for key in _setting_keys(definition)]
+    return sorted(key for key in keys if key not in read)
+
+
+def export() -> Dict[str, Any]:
+    return {
+        'sample_rate': _sample_rate,
+        'reads': snapshot(),
+        'unread': unread(),
+    }
+
+
+def dump(stream: Optional[TextIO] = None) -> None:
+    """
+    :param stream: stream to write export() to as JSON, defaults to stderr
+    """
+    if stream is None:
+        stream = sys.stderr
+    json.dump(export(), stream, indent=2, sort_keys=True)
+    stream.write('\n')
+
+
+def dump_at_exit(path: Optional[str] = None) -> None:
+    """
+    Write export() as JSON when the interpreter exits. Calling this
+    again replaces the destination rather than adding another dump.
+    :param path: file to write, defaults to stderr
+    """
+    global _dump_registered, _dump_path
+    _dump_path = path
+    if not _dump_registered:
+        _dump_registered = True
+        atexit.register(_dump_at_exit)
+
+
+def _dump_at_exit() -> None:
+    if _dump_path is None:
+        dump()
+    else:
+        with open(_dump_path, 'w') as fh:
+            dump(fh)
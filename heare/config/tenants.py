@@ -0,0 +1,150 @@
+"""
+Copy-on-write, per-tenant views over a loaded SettingsDefinition.
+
+    base = MyConfig.load()
+    tenants = TenantViews(base, {
+        'acme': {'timeout': '5.0'},
+        'globex': {'timeout': '1.0', 'region': 'eu'},
+    })
+    tenants['acme'].timeout.get()  # 5.0
+    tenants['acme'].region.get()   # from base
+
+Each view stores only the settings a tenant overrides. All other settings
+are the base's GettableSetting objects, shared by every view, and are
+found through the view's class without any per-tenant storage.
+"""
+import time
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional
+
+from heare.config import AnySetting, _nested_definitions, _setting_specs
+
+OverrideTable = Mapping[str, Mapping[str, Any]]
+
+
+class TenantView(object):
+    """
+    Base class of the view classes generated per base config, which also
+    subclass the config's definition. Overridden settings are instance
+    attributes; all others resolve to the shared base settings held as
+    class attributes.
+    """
+
+
+class TenantViews(object):
+    def __init__(self,
+                 base: Any,
+                 overrides: Optional[OverrideTable] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param base: a loaded SettingsDefinition shared by all tenants
+        :param overrides: maps tenant to a mapping of setting name to
+            value, as strings or already typed values
+        :param clock: time source used to track idle views
+        """
+        self.base: Any = base
+        self.settings_class: type = base.__class__
+        self.specs: Dict[str, AnySetting] = \
+            dict(_setting_specs(self.settings_class))
+        self.overrides: Dict[str, Mapping[str, Any]] = {}
+        self.views: Dict[str, TenantView] = {}
+        self.last_access: Dict[str, float] = {}
+        self.clock: Callable[[], float] = clock
+
+        # nested definitions are shared as a whole, tenants override only
+        # the top level settings
+        shared = {name: getattr(base, name) for name in self.specs}
+        for name, _ in _nested_definitions(self.settings_class):
+            shared[name] = getattr(base, name)
+        # views are instances of the definition, keeping its methods and
+        # properties, but are not discovered as definitions themselves
+        shared['_generated_view'] = True
+        self.view_class: type = type(
+            f"{self.settings_class.__name__}TenantView",
+            (self.settings_class, TenantView),
+            shared)
+
+        if overrides:
+            self.update(overrides)
+
+    def update(self, overrides: OverrideTable) -> None:
+        """
+        Set the overrides for many tenants at once, replacing any existing
+        overrides for those tenants.
+        :param overrides: maps tenant to a mapping of setting name to value
+        """
+        for tenant, tenant_overrides in overrides.items():
+            unknown = set(tenant_overrides) - self.specs.keys()
+            if unknown:
+                raise ValueError(
+                    f"Unknown settings for {self.settings_class.__name__} "
+                    f"overridden by tenant {tenant}: {sorted(unknown)}"
+                )
+            self.overrides[tenant] = tenant_overrides
+            self.evict(tenant)
+
+    def view(self, tenant: str) -> Any:
+        """
+        :param tenant: the tenant to view, tenants without overrides see the
+            base config
+        :return: the tenant's view, built on first access
+        """
+        view = self.views.get(tenant)
+        if view is None:
+            view = self._build(tenant)
+            self.views[tenant] = view
+        self.last_access[tenant] = self.clock()
+        return view
+
+    __getitem__ = view
+
+    def build(self, tenants: Optional[Iterable[str]] = None) -> None:
+        """
+        Eagerly build views, surfacing invalid overrides up front.
+        :param tenants: tenants to build, defaults to all with overrides
+        """
+        for tenant in (self.overrides if tenants is None else tenants):
+            self.view(tenant)
+
+    def evict(self, tenant: str) -> None:
+        self.views.pop(tenant, None)
+        self.last_access.pop(tenant, None)
+
+    def evict_idle(self, max_idle_seconds: float) -> List[str]:
+        """
+        Drop views which have not been accessed recently. Evicted views
+        are rebuilt from their overrides on next access.
+        :param max_idle_seconds: evict views idle for longer than this
+        :return: the evicted tenants
+        """
+        cutoff = self.clock() - max_idle_seconds
+        # view() may record accesses from other threads meanwhile, so
+        # iterate over a snapshot
+        idle = [tenant for tenant, accessed in list(self.last_access.items())
+                if accessed < cutoff]
+        for tenant in idle:
+            self.evict(tenant)
+        return idle
+
+    def _build(self, tenant: str) -> TenantView:
+        view = self.view_class()
+        class_name = self.settings_class.__name__
+        for name, raw_value in self.overrides.get(tenant, {}).items():
+            if raw_value is None:
+                continue
+            spec = self.specs[name]
+            value: Any
+            try:
+                value = spec.from_raw_value(raw_value)
+            except ValueError as ex:
+                raise ValueError(
+                    f"Error parsing value of {class_name}.{name} "
+                    f"for tenant {tenant}: {ex}"
+                )
+            shared = getattr(self.base, name)
+            shared_value = shared.get()
+            # True == 1, so equal values of different types still differ
+            if value.__class__ is shared_value.__class__ and \
+                    value == shared_value:
+                continue
+            setattr(view, name, spec.to_gettable(value, shared.key))
+        return view
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Compares heare.config.formatters against the naive parsers projects tend
+to write for themselves: regexes compiled and scanned per call, and list
+values parsed one element at a time.
+
+    python scripts/bench_formatters.py
+"""
+import datetime
+import os
+import re
+import sys
+import timeit
+from typing import Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from heare.config import ListSetting  # noqa: E402
+from heare.config.formatters import boolean, duration, byte_size, \
+    iso_datetime  # noqa: E402
+
+NUMBER = 100000
+
+
+def naive_bool(value: str) -> bool:
+    if re.match(r'^\s*(true|yes|on|1)\s*$', value, re.IGNORECASE):
+        return True
+    if re.match(r'^\s*(false|no|off|0)?\s*$', value, re.IGNORECASE):
+        return False
+    raise ValueError(value)
+
+
+def naive_duration(value: str) -> datetime.timedelta:
+    units = {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    total = 0.0
+    for amount, unit in re.findall(r'(\d+(?:\.\d+)?)(ms|s|m|h|d)', value):
+        total += float(amount) * units[unit]
+    return datetime.timedelta(seconds=total)
+
+
+def naive_byte_size(value: str) -> int:
+    match = re.match(r'^(\d+(?:\.\d+)?)\s*([KMGT]?)(i?B?)$', value.strip(),
+                     re.IGNORECASE)
+    if not match:
+        raise ValueError(value)
+    exponent = ' KMGT'.index(match.group(2).upper() or ' ')
+    return int(float(match.group(1)) * 1024 ** exponent)
+
+
+def naive_datetime(value: str) -> datetime.datetime:
+    value = re.sub(r'Z$', '+00:00', value.strip())
+    return datetime.datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+
+
+def bench(label: str, fn: Callable[[], object]) -> float:
+    seconds = timeit.timeit(fn, number=NUMBER)
+    print(f"  {label:<10}{seconds / NUMBER * 1e9:10.1f} ns/op")
+    return seconds
+
+
+def compare(name: str, naive: Callable[[], object],
+            builtin: Callable[[], object]) -> None:
+    print(name)
+    slow = bench('naive', naive)
+    fast = bench('builtin', builtin)
+    print(f"  {'speedup':<10}{slow / fast:10.2f}x")
+
+
+def main() -> None:
+    compare('bool', lambda: naive_bool('false'), lambda: boolean('false'))
+    compare('duration', lambda: naive_duration('1h30m'),
+            lambda: duration('1h30m'))
+    compare('byte_size', lambda: naive_byte_size('64KiB'),
+            lambda: byte_size('64KiB'))
+    compare('datetime', lambda: naive_datetime('2024-01-02T03:04:05Z'),
+            lambda: iso_datetime('2024-01-02T03:04:05Z'))
+
+    csv = ','.join(['true', 'false'] * 50)
+    naive_list: ListSetting[bool] = ListSetting(naive_bool)
+    builtin_list: ListSetting[bool] = ListSetting(boolean)
+    compare('bool csv (100 elements)',
+            lambda: naive_list.from_raw_value(csv),
+            lambda: builtin_list.from_raw_value(csv))
+
+
+if __name__ == '__main__':
+    main()
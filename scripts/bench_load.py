@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Measures SettingsDefinition.load_all() latency for many flat definitions
+and for a deep tree of nested definitions with the same number of
+settings, each resolved from a mix of CLI flags, environment variables
+and an INI config file.
+
+    python scripts/bench_load.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from heare.config import SettingsDefinition, Setting, \
+    camel_to_big_snake  # noqa: E402
+
+DEFINITIONS = 50
+SETTINGS = 20
+REPEAT = 200
+# unrelated environment variables, as found in a typical process
+NOISE = 200
+
+
+def flat_definitions() -> List[type]:
+    return [
+        type(f"BenchFlat{idx}", (SettingsDefinition,), {
+            f"setting_{jdx}": Setting(int, default=jdx)
+            for jdx in range(SETTINGS)
+        })
+        for idx in range(DEFINITIONS)
+    ]
+
+
+def nested_definitions() -> Tuple[List[type], List[str]]:
+    """
+    :return: a root definition nesting DEFINITIONS definitions in a chain,
+        and the namespace of each
+    """
+    child = None
+    for idx in reversed(range(DEFINITIONS)):
+        attributes: Dict[str, object] = {
+            f"setting_{jdx}": Setting(int, default=jdx)
+            for jdx in range(SETTINGS)
+        }
+        if child is not None:
+            attributes['child'] = child
+        child = type(f"BenchNested{idx}", (SettingsDefinition,), attributes)
+    namespaces = ['.'.join(['BenchNested0'] + ['child'] * idx)
+                  for idx in range(DEFINITIONS)]
+    return [child], namespaces  # type: ignore
+
+
+def inputs(namespaces: List[str]) -> \
+        Tuple[List[str], Dict[str, str], str]:
+    args = ['bench']
+    env = {f"NOISE_VARIABLE_{idx}": 'x' for idx in range(NOISE)}
+    ini = []
+    for namespace in namespaces:
+        args.append(f"--{namespace}.setting_0=1")
+        prefix = '__'.join(camel_to_big_snake(segment)
+                           for segment in namespace.split('.'))
+        env[f"{prefix}__SETTING_1"] = '2'
+        ini += [f"[{namespace}]", "setting_2 = 3"]
+    return args, env, '\n'.join(ini) + '\n'
+
+
+def bench(label: str, definitions: List[type],
+          namespaces: List[str]) -> None:
+    args, env, ini = inputs(namespaces)
+    with tempfile.NamedTemporaryFile('w', suffix='.ini') as config_file:
+        config_file.write(ini)
+        config_file.flush()
+        samples = []
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            SettingsDefinition.load_all(
+                definitions, args=args, env=env,
+                config_files=[config_file.name])
+            samples.append(time.perf_counter() - start)
+    print(f"{label}: {DEFINITIONS * SETTINGS} settings, "
+          f"median {statistics.median(samples) * 1000:.3f} ms, "
+          f"min {min(samples) * 1000:.3f} ms")
+
+
+def main() -> None:
+    flat = flat_definitions()
+    bench('flat', flat, [definition.__name__ for definition in flat])
+    if '--flat' not in sys.argv:
+        nested, namespaces = nested_definitions()
+        bench('nested', nested, namespaces)
+
+
+if __name__ == '__main__':
+    main()
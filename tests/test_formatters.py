@@ -0,0 +1,124 @@
+import datetime
+import enum
+import unittest
+
+from heare.config import SettingsDefinition, Setting, ListSetting
+from heare.config.formatters import boolean, duration, byte_size, \
+    iso_datetime, enum_of
+
+
+class Color(enum.Enum):
+    RED = 'red'
+    GREEN = 'green'
+
+
+class FormatterTests(unittest.TestCase):
+    def test_boolean(self):
+        for value in ['true', 'TRUE', 'True', ' yes ', 'on', '1', 't']:
+            self.assertIs(True, boolean(value), value)
+        for value in ['false', 'FALSE', 'no', 'off', '0', '', 'F']:
+            self.assertIs(False, boolean(value), value)
+        self.assertIs(True, boolean(True))
+        with self.assertRaises(ValueError):
+            boolean('maybe')
+        self.assertEqual([True, False, True],
+                         boolean.parse_csv('true,false, Yes'))
+
+    def test_duration(self):
+        self.assertEqual(datetime.timedelta(seconds=90), duration('90'))
+        self.assertEqual(datetime.timedelta(seconds=1.5), duration('1.5'))
+        self.assertEqual(datetime.timedelta(milliseconds=500),
+                         duration('500ms'))
+        self.assertEqual(datetime.timedelta(hours=1, minutes=30),
+                         duration('1h30m'))
+        self.assertEqual(datetime.timedelta(days=2, seconds=5),
+                         duration('2d 5s'))
+        self.assertEqual(datetime.timedelta(seconds=3), duration(3))
+        with self.assertRaises(ValueError):
+            duration('')
+        with self.assertRaises(ValueError):
+            duration('5 fortnights')
+        with self.assertRaises(ValueError):
+            duration('1h thirty')
+        self.assertEqual(datetime.timedelta(hours=1, minutes=30),
+                         duration('30m1h'))
+
+    def test_byte_size(self):
+        self.assertEqual(512, byte_size('512'))
+        self.assertEqual(512, byte_size('512B'))
+        self.assertEqual(64 * 1024, byte_size('64KiB'))
+        self.assertEqual(10 * 1024 ** 2, byte_size('10M'))
+        self.assertEqual(1500 * 1000 ** 2, byte_size('1.5 GB'))
+        self.assertEqual(2000, byte_size('2kb'))
+        self.assertEqual(7, byte_size(7))
+        with self.assertRaises(ValueError):
+            byte_size('10 parsecs')
+        with self.assertRaises(ValueError):
+            byte_size('-1K')
+        with self.assertRaises(ValueError):
+            byte_size('KiB')
+        # fractional amounts must come to whole bytes
+        self.assertEqual(1536, byte_size('1.5KiB'))
+        with self.assertRaises(ValueError):
+            byte_size('1.5')
+        # typed values other than ints, e.g. JSON numbers
+        with self.assertRaises(ValueError):
+            byte_size(1.5)
+        with self.assertRaises(ValueError):
+            byte_size(True)
+
+    def test_iso_datetime(self):
+        utc = datetime.timezone.utc
+        self.assertEqual(
+            datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=utc),
+            iso_datetime('2024-01-02T03:04:05Z'))
+        self.assertEqual(datetime.datetime(2024, 1, 2),
+                         iso_datetime('2024-01-02'))
+        with self.assertRaises(ValueError):
+            iso_datetime('yesterday')
+
+    def test_enum(self):
+        color = enum_of(Color)
+        self.assertEqual('Color', color.__name__)
+        self.assertIs(Color.RED, color('RED'))
+        self.assertIs(Color.RED, color('red'))
+        self.assertIs(Color.GREEN, color(' Green '))
+        self.assertIs(Color.GREEN, color(Color.GREEN))
+        with self.assertRaises(ValueError):
+            color('blue')
+
+
+class FormatterSettingTests(unittest.TestCase):
+    def test_bool_setting_from_env(self):
+        class MyBoolSettings(SettingsDefinition):
+            foo = Setting(bool, default=True)
+            bar = Setting(bool, default=True)
+
+        result = MyBoolSettings.load(
+            args=[], env={'FOO': 'false', 'BAR': '0'})
+        self.assertIs(False, result.foo.get())
+        self.assertIs(False, result.bar.get())
+
+    def test_formatter_settings(self):
+        class MyFormattedSettings(SettingsDefinition):
+            timeout = Setting(duration)
+            sizes = ListSetting(byte_size)
+            colors = ListSetting(enum_of(Color))
+            flags = ListSetting(bool)
+
+        result = MyFormattedSettings.load(args=[
+            '--timeout=1m', '--sizes=1K,2K',
+            '--colors=red,GREEN', '--flags=yes,no'])
+        self.assertEqual(datetime.timedelta(minutes=1), result.timeout.get())
+        self.assertEqual([1024, 2048], result.sizes.get())
+        self.assertEqual([Color.RED, Color.GREEN], result.colors.get())
+        self.assertEqual([True, False], result.flags.get())
+
+    def test_formatter_parse_errors(self):
+        class MyBadFormattedSettings(SettingsDefinition):
+            sizes = ListSetting(byte_size)
+
+        with self.assertRaises(ValueError) as ve:
+            MyBadFormattedSettings.load(args=['--sizes=1K,lots'])
+        self.assertIn('1K,lots cannot be parsed as byte_size',
+                      str(ve.exception))
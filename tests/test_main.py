@@ -0,0 +1,66 @@
+import io
+import unittest
+
+from heare.config import SettingsDefinition, Setting, ListSetting
+from heare.config.__main__ import main
+
+
+class MainTests(unittest.TestCase):
+    def test_report(self):
+        class MyReportedSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(float, 1.0)
+            baz = ListSetting(int, [1])
+
+        out = io.StringIO()
+        status = main(['-d', 'MyReportedSettings', '--', '--foo=bar'], out)
+        report = out.getvalue()
+
+        self.assertEqual(0, status)
+        self.assertIn("foo = 'bar'  <CLISettingsSource>", report)
+        self.assertIn("bar = 1.0  <default>", report)
+        self.assertIn("baz = [1]  <default>", report)
+        self.assertIn("per source:", report)
+        self.assertIn("MyReportedSettings", report.split("per definition:")[1])
+
+    def test_report_errors(self):
+        class MyBrokenSettings(SettingsDefinition):
+            foo = Setting(str)
+
+        out = io.StringIO()
+        status = main(['-d', 'MyBrokenSettings'], out)
+
+        self.assertEqual(1, status)
+        self.assertIn("ERROR: Required config not satisfied: foo",
+                      out.getvalue())
+
+    def test_benchmark(self):
+        class MyBenchmarkedSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+
+        out = io.StringIO()
+        status = main(['-d', 'MyBenchmarkedSettings', '-r', '10'], out)
+
+        self.assertEqual(0, status)
+        self.assertIn("1 definitions, 10 loads", out.getvalue())
+        self.assertIn("median", out.getvalue())
+
+    def test_benchmark_errors(self):
+        class MyBrokenBenchmarkSettings(SettingsDefinition):
+            foo = Setting(str)
+
+        out = io.StringIO()
+        status = main(['-d', 'MyBrokenBenchmarkSettings', '-r', '10'], out)
+
+        self.assertEqual(1, status)
+        self.assertIn("ERROR: Required config not satisfied: foo",
+                      out.getvalue())
+        self.assertNotIn("median", out.getvalue())
+
+    def test_unknown_definition(self):
+        out = io.StringIO()
+        status = main(['-d', 'NoSuchSettings'], out)
+
+        self.assertEqual(1, status)
+        self.assertIn("No SettingsDefinition named NoSuchSettings",
+                      out.getvalue())
@@ -0,0 +1,229 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from heare.config import SettingsDefinition, Setting, ListSetting, \
+    SettingAliases, SecretFileCache, FileReferenceSettingsSource, \
+    EnvironSettingsSource
+
+
+class FileReferenceTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.now = 0.0
+        self.cache = SecretFileCache(ttl=10.0, clock=lambda: self.now)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name: str, content: str) -> str:
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w') as fh:
+            fh.write(content)
+        return path
+
+    def load(self, settings_class, env):
+        sources = [
+            EnvironSettingsSource(env),
+            FileReferenceSettingsSource(env, self.cache),
+        ]
+        return SettingsDefinition.load_for_class(settings_class, sources)
+
+    def test_env_file_reference(self):
+        class MySecretSettings(SettingsDefinition):
+            password = Setting(str)
+            port = Setting(int)
+            hosts = ListSetting(str)
+
+        env = {
+            'PASSWORD_FILE': self.write('password', 'hunter2\n'),
+            'MY_SECRET_SETTINGS__PORT_FILE': self.write('port', '5432'),
+            'HOSTS_FILE': self.write('hosts', 'a,b\n'),
+        }
+        result = self.load(MySecretSettings, env)
+
+        # nothing is read until first use
+        self.assertEqual(0, result.password.secret_file.version)
+        self.assertEqual('hunter2', result.password.get())
+        self.assertEqual(5432, result.port.get())
+        self.assertEqual(['a', 'b'], result.hosts.get())
+
+    def test_inline_value_takes_precedence(self):
+        class MyInlineSettings(SettingsDefinition):
+            password = Setting(str)
+
+        env = {
+            'PASSWORD': 'inline',
+            'PASSWORD_FILE': self.write('password', 'from file'),
+        }
+        self.assertEqual('inline',
+                         self.load(MyInlineSettings, env).password.get())
+
+    def test_file_alias(self):
+        path = self.write('token', 'abc')
+
+        class MyAliasedSecretSettings(SettingsDefinition):
+            token = Setting(str, aliases=SettingAliases(file=path))
+            missing = Setting(str, default='fallback', aliases=SettingAliases(
+                file=os.path.join(self.directory.name, 'missing')))
+
+        result = self.load(MyAliasedSecretSettings, {})
+        self.assertEqual('abc', result.token.get())
+        self.assertEqual('fallback', result.missing.get())
+
+    def test_rotation(self):
+        class MyRotatedSettings(SettingsDefinition):
+            password = Setting(str)
+
+        path = self.write('password', 'first')
+        result = self.load(MyRotatedSettings, {'PASSWORD_FILE': path})
+        self.assertEqual('first', result.password.get())
+
+        self.write('password', 'second!')
+        self.now = 5.0
+        self.assertEqual('first', result.password.get())
+        self.now = 10.0
+        self.assertEqual('second!', result.password.get())
+
+    def test_stat_calls_batched(self):
+        class MyBatchedSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(str)
+
+        env = {
+            'FOO_FILE': self.write('foo', 'foo'),
+            'BAR_FILE': self.write('bar', 'bar'),
+        }
+        result = self.load(MyBatchedSettings, env)
+        result.foo.get()
+        result.bar.get()
+
+        with mock.patch('os.stat', wraps=os.stat) as stat:
+            for _ in range(10):
+                result.foo.get()
+                result.bar.get()
+            self.assertEqual(0, stat.call_count)
+
+            self.now = 10.0
+            for _ in range(10):
+                result.foo.get()
+                result.bar.get()
+            self.assertEqual(2, stat.call_count)
+
+    def test_parse_error_on_get(self):
+        class MyBadSecretSettings(SettingsDefinition):
+            port = Setting(int)
+
+        path = self.write('port', 'not a port')
+        result = self.load(MyBadSecretSettings, {'PORT_FILE': path})
+
+        with self.assertRaises(ValueError) as ve:
+            result.port.get()
+        self.assertIn(f'MyBadSecretSettings.port from {path}',
+                      str(ve.exception))
+
+    def test_missing_file_reference(self):
+        class MyMissingSecretSettings(SettingsDefinition):
+            password = Setting(str)
+            optional = Setting(str, default='fallback')
+
+        missing = os.path.join(self.directory.name, 'missing')
+        with self.assertRaises(ValueError) as ve:
+            self.load(MyMissingSecretSettings, {'PASSWORD_FILE': missing})
+        self.assertIn('password', str(ve.exception))
+
+        result = self.load(MyMissingSecretSettings, {
+            'PASSWORD': 'inline',
+            'OPTIONAL_FILE': missing,
+        })
+        self.assertEqual('fallback', result.optional.get())
+
+    def test_file_removed_after_load(self):
+        class MyRemovedSecretSettings(SettingsDefinition):
+            password = Setting(str)
+            optional = Setting(str, default='fallback')
+
+        env = {
+            'PASSWORD_FILE': self.write('password', 'hunter2'),
+            'OPTIONAL_FILE': self.write('optional', 'configured'),
+        }
+        result = self.load(MyRemovedSecretSettings, env)
+        os.remove(env['PASSWORD_FILE'])
+        os.remove(env['OPTIONAL_FILE'])
+
+        with self.assertRaises(ValueError) as ve:
+            result.password.get()
+        self.assertIn('MyRemovedSecretSettings.password', str(ve.exception))
+        self.assertEqual('fallback', result.optional.get())
+
+    def test_rotation_serves_last_content_while_missing(self):
+        class MyReplacedSettings(SettingsDefinition):
+            password = Setting(str)
+
+        path = self.write('password', 'first')
+        result = self.load(MyReplacedSettings, {'PASSWORD_FILE': path})
+        self.assertEqual('first', result.password.get())
+
+        os.remove(path)
+        self.now = 10.0
+        self.assertEqual('first', result.password.get())
+
+        self.write('password', 'second')
+        self.now = 20.0
+        self.assertEqual('second', result.password.get())
+
+    def test_removed_file_served_for_one_ttl(self):
+        class MyExpiringSettings(SettingsDefinition):
+            password = Setting(str)
+            optional = Setting(str, default='fallback')
+
+        env = {
+            'PASSWORD_FILE': self.write('password', 'hunter2'),
+            'OPTIONAL_FILE': self.write('optional', 'configured'),
+        }
+        result = self.load(MyExpiringSettings, env)
+        self.assertEqual('hunter2', result.password.get())
+        self.assertEqual('configured', result.optional.get())
+
+        os.remove(env['PASSWORD_FILE'])
+        os.remove(env['OPTIONAL_FILE'])
+        self.now = 10.0
+        self.assertEqual('hunter2', result.password.get())
+        self.assertEqual('configured', result.optional.get())
+
+        self.now = 20.0
+        with self.assertRaises(ValueError) as ve:
+            result.password.get()
+        self.assertIn('MyExpiringSettings.password', str(ve.exception))
+        self.assertEqual('fallback', result.optional.get())
+
+        self.write('optional', 'restored')
+        self.now = 30.0
+        self.assertEqual('restored', result.optional.get())
+
+    def test_load_with_secret_cache(self):
+        class MyCachedSecretSettings(SettingsDefinition):
+            password = Setting(str)
+
+        path = self.write('password', 'hunter2')
+        result = MyCachedSecretSettings.load(
+            args=['test'], env={'PASSWORD_FILE': path},
+            secret_cache=self.cache)
+
+        self.assertIs(self.cache, result.password.secret_file.cache)
+        self.assertEqual('hunter2', result.password.get())
+
+    def test_file_reference_not_interpolated(self):
+        class MyDerivedSecretSettings(SettingsDefinition):
+            password = Setting(str)
+            dsn = Setting(str)
+
+        env = {
+            'PASSWORD_FILE': self.write('password', 'hunter2'),
+            'DSN': 'db://user:${MyDerivedSecretSettings.password}@db',
+        }
+        with self.assertRaises(ValueError) as ve:
+            self.load(MyDerivedSecretSettings, env)
+        self.assertIn('${MyDerivedSecretSettings.password}',
+                      str(ve.exception))
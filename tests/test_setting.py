@@ -1,9 +1,12 @@
+import os
 import unittest
 import tempfile
 from typing import Callable, List
+from unittest import mock
 
 from heare.config import SettingsDefinition, \
-    Setting, SettingAliases, ListSetting
+    Setting, SettingAliases, ListSetting, LazySettingsSource
+from heare.config import telemetry
 
 
 class SettingsDefinitionTests(unittest.TestCase):
@@ -140,9 +143,10 @@ class SettingsDefinitionTests(unittest.TestCase):
             '-b'
         ]
 
-        result = MySettings.load(args=args, env={'FOO': 'bar', 'BAR': ''})
+        result = MySettings.load(args=args, env={'FOO': 'baz', 'BAR': ''})
 
-        self.assertFalse(result.bar.get())
+        # CLI arguments take precedence over environment variables
+        self.assertTrue(result.bar.get())
         self.assertEqual('bar', result.foo.get())
 
     def test_env_variable_naming_precedence(self):
@@ -276,4 +280,470 @@ class SettingTypingTests(unittest.TestCase):
             foo = Setting(custom_formatter, default=formatted)
 
         settings = MySettings.load(args=[])
-        self.assertEqual(formatted, settings.foo.get())
\ No newline at end of file
+        self.assertEqual(formatted, settings.foo.get())
+
+
+class HydratorTests(unittest.TestCase):
+    def test_hydrator_is_cached_per_class(self):
+        from heare.config import _HYDRATORS
+
+        class MyCachedSettings(SettingsDefinition):
+            foo = Setting(str, default='bar')
+
+        first = MyCachedSettings.load(args=['--foo=baz'])
+        hydrate = _HYDRATORS[MyCachedSettings]
+        second = MyCachedSettings.load(args=['--foo=bing'])
+
+        self.assertIs(hydrate, _HYDRATORS[MyCachedSettings])
+        self.assertEqual('baz', first.foo.get())
+        self.assertEqual('bing', second.foo.get())
+
+    def test_error_messages(self):
+        class MyErrorSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(float, 1.0)
+
+        with self.assertRaises(ValueError) as missing:
+            MyErrorSettings.load(args=['--bar=2.0'])
+        self.assertTrue(str(missing.exception).startswith(
+            'Required config not satisfied: foo, '))
+
+        with self.assertRaises(ValueError) as invalid:
+            MyErrorSettings.load(args=['--foo=a', '--bar=bing'])
+        self.assertEqual(
+            'Error parsing value of MyErrorSettings.bar: '
+            'bing cannot be parsed as float',
+            str(invalid.exception))
+
+    def test_subclass_settings_not_inherited(self):
+        class MyBaseSettings(SettingsDefinition):
+            foo = Setting(str, default='bar')
+
+        class MyChildSettings(MyBaseSettings):
+            bar = Setting(str, default='baz')
+
+        result = MyChildSettings.load(args=['--foo=bing'])
+        self.assertTrue(isinstance(result, MyChildSettings))
+        self.assertEqual('baz', result.bar.get())
+        # settings declared on a parent class are not hydrated
+        self.assertEqual('bar', result.foo.get())
+
+
+class TypedConfigFileTests(unittest.TestCase):
+    def test_json_config_file(self):
+        class MyJsonSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(float)
+            baz = Setting(bool, default=False)
+            numbers = ListSetting(int)
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as config_file:
+            config_file.write(b"""
+            {"MyJsonSettings": {
+                "foo": "bar,with,commas",
+                "bar": 1,
+                "baz": true,
+                "numbers": [1, 2, 3]
+            }}
+            """)
+            config_file.flush()
+
+            result = MyJsonSettings.load(config_files=[config_file.name])
+
+            self.assertEqual("bar,with,commas", result.foo.get())
+            self.assertEqual(1.0, result.bar.get())
+            self.assertTrue(isinstance(result.bar.get(), float))
+            self.assertIs(True, result.baz.get())
+            self.assertEqual([1, 2, 3], result.numbers.get())
+
+    def test_typed_values_checked(self):
+        class MyCheckedSettings(SettingsDefinition):
+            count = Setting(int, required=False)
+            counts = ListSetting(int, required=False)
+
+        for document, key in [(b'{"count": 1.9}', 'count'),
+                              (b'{"count": true}', 'count'),
+                              (b'{"counts": [1, 2.5]}', 'counts')]:
+            with tempfile.NamedTemporaryFile(suffix='.json') as config_file:
+                config_file.write(b'{"MyCheckedSettings": %s}' % document)
+                config_file.flush()
+
+                with self.assertRaises(ValueError) as ve:
+                    MyCheckedSettings.load(args=['test'], env={},
+                                           config_files=[config_file.name])
+                self.assertIn(f'MyCheckedSettings.{key}', str(ve.exception))
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as config_file:
+            config_file.write(
+                b'{"MyCheckedSettings": {"count": 2.0, "counts": [3.0]}}')
+            config_file.flush()
+
+            result = MyCheckedSettings.load(args=['test'], env={},
+                                            config_files=[config_file.name])
+            self.assertIs(int, result.count.get().__class__)
+            self.assertEqual(2, result.count.get())
+            self.assertEqual([3], result.counts.get())
+
+    def test_toml_config_file(self):
+        class MyTomlSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(float)
+            names = ListSetting(str)
+
+        with tempfile.NamedTemporaryFile(suffix='.toml') as config_file:
+            config_file.write(b"""
+[MyTomlSettings]
+foo = "bar"
+bar = 2.5
+names = ["a,b", "c"]
+""")
+            config_file.flush()
+
+            result = MyTomlSettings.load(config_files=[config_file.name])
+
+            self.assertEqual("bar", result.foo.get())
+            self.assertEqual(2.5, result.bar.get())
+            self.assertEqual(["a,b", "c"], result.names.get())
+
+    def test_mixed_config_files(self):
+        class MyMixedSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(int)
+
+        with tempfile.NamedTemporaryFile(suffix='.ini') as ini_file, \
+                tempfile.NamedTemporaryFile(suffix='.json') as json_file:
+            ini_file.write(b"""
+            [MyMixedSettings]
+            foo = bar
+            """)
+            ini_file.flush()
+            json_file.write(b'{"MyMixedSettings": {"bar": 3}}')
+            json_file.flush()
+
+            result = MyMixedSettings.load(
+                config_files=[ini_file.name, json_file.name])
+
+            self.assertEqual("bar", result.foo.get())
+            self.assertEqual(3, result.bar.get())
+
+    def test_config_path_directory_order(self):
+        class MyDirectorySettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(str)
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name, content in [
+                    ('zz.ini', '[MyDirectorySettings]\nfoo = ini'),
+                    ('mm.json', '{"MyDirectorySettings": {"bar": "json"}}'),
+                    ('aa.toml', '[MyDirectorySettings]\nfoo = "toml"'),
+                    ('notes.txt', 'not a config file')]:
+                with open(os.path.join(directory, name), 'w') as fh:
+                    fh.write(content)
+
+            with mock.patch.dict(os.environ,
+                                 {'HEARE_CONFIG_PATH': directory}):
+                result = MyDirectorySettings.load(args=['test'], env={})
+
+            # files are ordered by name across formats, the last wins
+            self.assertEqual('ini', result.foo.get())
+            self.assertEqual('json', result.bar.get())
+
+    def test_typed_value_parse_error(self):
+        class MyBadJsonSettings(SettingsDefinition):
+            bar = Setting(int)
+
+        with tempfile.NamedTemporaryFile(suffix='.json') as config_file:
+            config_file.write(b'{"MyBadJsonSettings": {"bar": [1, 2]}}')
+            config_file.flush()
+
+            with self.assertRaises(ValueError):
+                MyBadJsonSettings.load(config_files=[config_file.name])
+
+
+class PrecedenceTests(unittest.TestCase):
+    def test_source_precedence(self):
+        class MyLayeredSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(str)
+            baz = Setting(str)
+            bing = Setting(str, default='default')
+
+        with tempfile.NamedTemporaryFile(suffix='.ini') as config_file:
+            config_file.write(b"""
+            [MyLayeredSettings]
+            foo = file
+            bar = file
+            baz = file
+            """)
+            config_file.flush()
+
+            result = MyLayeredSettings.load(
+                args=['--foo=cli'],
+                env={'FOO': 'env', 'BAR': 'env'},
+                config_files=[config_file.name])
+
+            self.assertEqual('cli', result.foo.get())
+            self.assertEqual('env', result.bar.get())
+            self.assertEqual('file', result.baz.get())
+            self.assertEqual('default', result.bing.get())
+
+    def test_last_config_file_wins(self):
+        class MyMultiFileSettings(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(float)
+
+        with tempfile.NamedTemporaryFile(suffix='.ini') as file1, \
+                tempfile.NamedTemporaryFile(suffix='.ini') as file2:
+            file1.write(b"""
+            [MyMultiFileSettings]
+            foo = bar
+            bar = 1.0
+            """)
+            file1.flush()
+            file2.write(b"""
+            [MyMultiFileSettings]
+            bar = 2.0
+            """)
+            file2.flush()
+
+            result = MyMultiFileSettings.load(
+                config_files=[file1.name, file2.name])
+
+            self.assertEqual('bar', result.foo.get())
+            self.assertEqual(2.0, result.bar.get())
+
+    def test_config_files_opened_lazily(self):
+        class MyEnvOnlySettings(SettingsDefinition):
+            foo = Setting(str)
+
+        with tempfile.NamedTemporaryFile(suffix='.ini') as config_file:
+            config_file.write(b"""
+            [MyEnvOnlySettings]
+            foo = file
+            """)
+            config_file.flush()
+
+            sources = SettingsDefinition.build_sources(
+                args=['--foo=cli'], env={'FOO': 'env'},
+                config_files=[config_file.name])
+            file_source = sources[-1]
+            self.assertTrue(isinstance(file_source, LazySettingsSource))
+
+            result = SettingsDefinition.load_for_class(
+                MyEnvOnlySettings, sources)
+            self.assertEqual('cli', result.foo.get())
+            self.assertFalse(file_source.is_open)
+
+            result = SettingsDefinition.load_for_class(
+                MyEnvOnlySettings, sources[2:])
+            self.assertEqual('file', result.foo.get())
+            self.assertTrue(file_source.is_open)
+
+
+class InterpolationTests(unittest.TestCase):
+    def test_cross_definition_interpolation(self):
+        class MyDatabase(SettingsDefinition):
+            host = Setting(str, default='localhost')
+            port = Setting(int, default=5432)
+
+        class MyService(SettingsDefinition):
+            url = Setting(str)
+            urls = ListSetting(str)
+
+        result = MyService.load(
+            args=['--MyDatabase.port=6543'],
+            env={
+                'MY_SERVICE__URL':
+                    'db://${MyDatabase.host}:${MyDatabase.port}',
+                'URLS': '${MyService.url},db://other',
+            })
+
+        self.assertEqual('db://localhost:6543', result.url.get())
+        self.assertEqual(['db://localhost:6543', 'db://other'],
+                         result.urls.get())
+
+    def test_interpolation_from_config_file(self):
+        class MyPaths(SettingsDefinition):
+            root = Setting(str)
+            logs = Setting(str)
+            escaped = Setting(str)
+
+        with tempfile.NamedTemporaryFile(suffix='.ini') as config_file:
+            config_file.write(b"""
+            [MyPaths]
+            root = /srv
+            logs = ${MyPaths.root}/logs
+            escaped = $${MyPaths.root}
+            """)
+            config_file.flush()
+
+            result = MyPaths.load(config_files=[config_file.name])
+
+            self.assertEqual('/srv/logs', result.logs.get())
+            self.assertEqual('${MyPaths.root}', result.escaped.get())
+
+    def test_load_all_shares_resolution(self):
+        class MyShared(SettingsDefinition):
+            name = Setting(str, default='shared')
+
+        class MyFirstUser(SettingsDefinition):
+            label = Setting(str, default='first-${MyShared.name}')
+
+        class MySecondUser(SettingsDefinition):
+            label = Setting(str)
+
+        results = SettingsDefinition.load_all(
+            [MyShared, MyFirstUser, MySecondUser], args=[],
+            env={'MY_SECOND_USER__LABEL': 'second-${MyShared.name}'})
+
+        self.assertEqual('shared', results[MyShared].name.get())
+        # defaults are not interpolated, only configured values
+        self.assertEqual('first-${MyShared.name}',
+                         results[MyFirstUser].label.get())
+        self.assertEqual('second-shared', results[MySecondUser].label.get())
+
+    def test_referenced_default_not_interpolated(self):
+        class MyReferenced(SettingsDefinition):
+            y = Setting(str, default='b')
+            x = Setting(str, default='a-${MyReferenced.y}')
+            z = Setting(str)
+
+        result = MyReferenced.load(args=[], env={'Z': '${MyReferenced.x}'})
+        self.assertEqual('a-${MyReferenced.y}', result.x.get())
+        self.assertEqual(result.x.get(), result.z.get())
+
+    def test_interpolation_cycle(self):
+        class MyCycle(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(str)
+
+        with self.assertRaises(ValueError) as ve:
+            MyCycle.load(args=[], env={
+                'FOO': '${MyCycle.bar}',
+                'BAR': 'x${MyCycle.foo}',
+            })
+        self.assertIn('MyCycle.foo -> MyCycle.bar -> MyCycle.foo',
+                      str(ve.exception))
+
+    def test_unresolved_interpolation(self):
+        class MyDangling(SettingsDefinition):
+            foo = Setting(str)
+            bar = Setting(str, required=False)
+
+        with self.assertRaises(ValueError):
+            MyDangling.load(args=[], env={'FOO': '${MyDangling.bar}'})
+        with self.assertRaises(ValueError):
+            MyDangling.load(args=[], env={'FOO': '${NoSuchSettings.bar}'})
+
+
+class NestedDefinitionTests(unittest.TestCase):
+    def nested_definition(self) -> type:
+        class MyPool(SettingsDefinition):
+            size = Setting(int, default=5)
+            timeout = Setting(float, default=1.0)
+
+        class MyDatabase(SettingsDefinition):
+            host = Setting(str, default='localhost')
+            pool = MyPool
+
+        class MyNestedService(SettingsDefinition):
+            name = Setting(str, default='service')
+            db = MyDatabase
+
+        return MyNestedService
+
+    def test_nested_from_cli_and_env(self):
+        definition = self.nested_definition()
+        result = definition.load(
+            args=['--MyNestedService.db.pool.size=20'],
+            env={'MY_NESTED_SERVICE__DB__HOST': 'db.internal',
+                 'TIMEOUT': '2.5'})
+
+        self.assertEqual('service', result.name.get())
+        self.assertEqual('db.internal', result.db.host.get())
+        self.assertEqual(20, result.db.pool.size.get())
+        self.assertEqual(2.5, result.db.pool.timeout.get())
+        self.assertEqual('MyNestedService.db.pool.size',
+                         result.db.pool.size.key)
+
+    def test_nested_from_config_files(self):
+        definition = self.nested_definition()
+        with tempfile.NamedTemporaryFile(suffix='.ini') as ini_file, \
+                tempfile.NamedTemporaryFile(suffix='.json') as json_file:
+            ini_file.write(b"""
+            [MyNestedService.db]
+            host = ini.internal
+
+            [MyNestedService.db.pool]
+            size = 10
+            """)
+            ini_file.flush()
+            json_file.write(b"""
+            {"MyNestedService": {"db": {"pool": {"timeout": 3.0}}}}
+            """)
+            json_file.flush()
+
+            result = definition.load(
+                args=[], env={},
+                config_files=[ini_file.name, json_file.name])
+
+            self.assertEqual('ini.internal', result.db.host.get())
+            self.assertEqual(10, result.db.pool.size.get())
+            self.assertEqual(3.0, result.db.pool.timeout.get())
+
+    def test_inner_definitions_not_discovered(self):
+        class MySharedCache(SettingsDefinition):
+            port = Setting(int, default=6379)
+
+        class MyOuterService(SettingsDefinition):
+            url = Setting(str, required=False)
+            cache = MySharedCache
+
+            class queue(SettingsDefinition):
+                depth = Setting(int, default=10)
+
+        discovered = SettingsDefinition.discover()
+        self.assertIn(MyOuterService, discovered)
+        self.assertIn(MySharedCache, discovered)
+        self.assertNotIn(MyOuterService.queue, discovered)
+
+        # a definition assigned as an attribute remains a top level one
+        result = MyOuterService.load(
+            args=['--MyOuterService.url=redis://${MySharedCache.port}'],
+            env={})
+        self.assertEqual('redis://6379', result.url.get())
+        self.assertEqual(10, result.queue.depth.get())
+
+    def test_nested_interpolation(self):
+        definition = self.nested_definition()
+        result = definition.load(args=[], env={
+            'MY_NESTED_SERVICE__NAME':
+                '${MyNestedService.db.host}-${MyNestedService.db.pool.size}',
+            'MY_NESTED_SERVICE__DB__HOST': 'db.internal',
+        })
+
+        self.assertEqual('db.internal-5', result.name.get())
+
+    def test_circular_nesting(self):
+        class MyCircularA(SettingsDefinition):
+            foo = Setting(str, default='a')
+
+        class MyCircularB(SettingsDefinition):
+            a = MyCircularA
+
+        MyCircularA.b = MyCircularB  # type: ignore
+        # break the cycle afterwards, so later discovery is unaffected
+        self.addCleanup(delattr, MyCircularA, 'b')
+
+        with self.assertRaises(ValueError) as ve:
+            MyCircularA.load(args=['test'], env={})
+        self.assertIn('MyCircularA.b -> MyCircularB.a -> MyCircularA',
+                      str(ve.exception))
+        with self.assertRaises(ValueError):
+            telemetry.unread([MyCircularB])
+
+    def test_nested_invalid_value(self):
+        definition = self.nested_definition()
+        with self.assertRaises(ValueError) as ve:
+            definition.load(args=['--MyNestedService.db.pool.size=many'])
+        self.assertIn('MyNestedService.db.pool.size', str(ve.exception))
@@ -0,0 +1,111 @@
+import io
+import json
+import threading
+import unittest
+
+from heare.config import SettingsDefinition, Setting, ListSetting, \
+    GettableSetting
+from heare.config import telemetry
+
+
+class TelemetryTests(unittest.TestCase):
+    def setUp(self):
+        telemetry.reset()
+
+    def tearDown(self):
+        telemetry.disable()
+        telemetry.reset()
+
+    def test_disabled_by_default(self):
+        class MyQuietSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+
+        original_get = GettableSetting.__dict__['get']
+        telemetry.enable()
+        telemetry.disable()
+        self.assertIs(original_get, GettableSetting.__dict__['get'])
+
+        result = MyQuietSettings.load(args=[])
+        result.foo.get()
+        self.assertFalse(telemetry.is_enabled())
+        self.assertEqual({}, telemetry.snapshot())
+
+    def test_counts_reads(self):
+        class MyCountedSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+            bar = ListSetting(int, [1])
+            baz = Setting(str, 'unused')
+
+        telemetry.enable()
+        result = MyCountedSettings.load(args=[])
+        for _ in range(3):
+            self.assertEqual('bar', result.foo.get())
+        self.assertEqual([1], result.bar.get())
+
+        counts = telemetry.snapshot()
+        self.assertEqual(3, counts['MyCountedSettings.foo'])
+        self.assertEqual(1, counts['MyCountedSettings.bar'])
+        self.assertEqual(['MyCountedSettings.baz'],
+                         telemetry.unread([MyCountedSettings]))
+        self.assertEqual([('MyCountedSettings.foo', 3)], telemetry.hot(2))
+
+    def test_sampling(self):
+        class MySampledSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+
+        telemetry.enable(sample_rate=10)
+        result = MySampledSettings.load(args=[])
+        for _ in range(1000):
+            result.foo.get()
+
+        self.assertEqual(1000, telemetry.snapshot()['MySampledSettings.foo'])
+
+    def test_unread_exact_when_sampled(self):
+        class MySparseSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+            baz = Setting(str, 'unused')
+
+        telemetry.enable(sample_rate=100)
+        result = MySparseSettings.load(args=[])
+        for _ in range(50):
+            result.foo.get()
+
+        # whether foo is sampled depends on the thread's countdown, but it
+        # is never reported unread
+        self.assertEqual(['MySparseSettings.baz'],
+                         telemetry.unread([MySparseSettings]))
+
+    def test_threads_merged(self):
+        class MyThreadedSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+
+        telemetry.enable()
+        result = MyThreadedSettings.load(args=[])
+
+        def read():
+            for _ in range(100):
+                result.foo.get()
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(400, telemetry.snapshot()['MyThreadedSettings.foo'])
+        self.assertEqual([], telemetry.unread([MyThreadedSettings]))
+        # finished threads are folded into the shared totals
+        self.assertLessEqual(len(telemetry._thread_counters), 1)
+
+    def test_dump(self):
+        class MyDumpedSettings(SettingsDefinition):
+            foo = Setting(str, 'bar')
+
+        telemetry.enable()
+        MyDumpedSettings.load(args=[]).foo.get()
+
+        out = io.StringIO()
+        telemetry.dump(out)
+        exported = json.loads(out.getvalue())
+        self.assertEqual(1, exported['reads']['MyDumpedSettings.foo'])
+        self.assertEqual(1, exported['sample_rate'])
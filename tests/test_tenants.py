@@ -0,0 +1,88 @@
+import unittest
+
+from heare.config import SettingsDefinition, Setting, ListSetting
+from heare.config.tenants import TenantViews
+
+
+class MyTenantSettings(SettingsDefinition):
+    timeout = Setting(float, 1.0)
+    region = Setting(str, 'us')
+    hosts = ListSetting(str, ['a'])
+
+    @property
+    def endpoint(self) -> str:
+        return f"https://{self.region.get()}.example.com"
+
+
+class TenantViewTests(unittest.TestCase):
+    def setUp(self):
+        self.base = MyTenantSettings.load(args=[])
+        self.now = 0.0
+        self.tenants = TenantViews(self.base, {
+            'acme': {'timeout': '5.0'},
+            'globex': {'region': 'eu', 'hosts': ['b', 'c']},
+        }, clock=lambda: self.now)
+
+    def test_overrides(self):
+        acme = self.tenants['acme']
+        self.assertEqual(5.0, acme.timeout.get())
+        self.assertEqual('us', acme.region.get())
+
+        globex = self.tenants.view('globex')
+        self.assertEqual(1.0, globex.timeout.get())
+        self.assertEqual('eu', globex.region.get())
+        self.assertEqual(['b', 'c'], globex.hosts.get())
+
+        # tenants without overrides see the base config
+        self.assertEqual(1.0, self.tenants['initech'].timeout.get())
+
+    def test_base_settings_shared(self):
+        acme = self.tenants['acme']
+        self.assertIs(self.base.region, acme.region)
+        self.assertEqual({'timeout'}, set(vars(acme)))
+        self.assertIs(acme, self.tenants['acme'])
+
+    def test_view_is_definition(self):
+        globex = self.tenants['globex']
+        self.assertIsInstance(globex, MyTenantSettings)
+        self.assertEqual('https://eu.example.com', globex.endpoint)
+        self.assertEqual('https://us.example.com',
+                         self.tenants['acme'].endpoint)
+        self.assertNotIn(self.tenants.view_class,
+                         SettingsDefinition.discover())
+
+    def test_overrides_equal_to_base_not_stored(self):
+        self.tenants.update({'acme': {'timeout': '1.0', 'region': 'eu'}})
+        self.assertEqual({'region'}, set(vars(self.tenants['acme'])))
+
+    def test_override_of_another_type_stored(self):
+        class MyFlagSettings(SettingsDefinition):
+            level = Setting(lambda value: value, 1)
+
+        tenants = TenantViews(MyFlagSettings.load(args=[]),
+                              {'acme': {'level': True}})
+        self.assertIs(True, tenants['acme'].level.get())
+
+    def test_unknown_setting(self):
+        with self.assertRaises(ValueError):
+            self.tenants.update({'acme': {'retries': '3'}})
+
+    def test_invalid_override(self):
+        self.tenants.update({'acme': {'timeout': 'soon'}})
+        with self.assertRaises(ValueError) as ve:
+            self.tenants.build()
+        self.assertIn('MyTenantSettings.timeout for tenant acme',
+                      str(ve.exception))
+
+    def test_evict_idle(self):
+        acme = self.tenants['acme']
+        self.now = 10.0
+        self.tenants['globex']
+        self.now = 20.0
+
+        self.assertEqual(['acme'], self.tenants.evict_idle(15.0))
+        self.assertEqual({'globex'}, set(self.tenants.views))
+
+        rebuilt = self.tenants['acme']
+        self.assertIsNot(acme, rebuilt)
+        self.assertEqual(5.0, rebuilt.timeout.get())